@@ -0,0 +1,190 @@
+import os
+import uuid
+from itertools import islice
+import psycopg
+from dotenv import load_dotenv
+from pgvector.psycopg import register_vector
+from sqlalchemy.engine import make_url
+from chatbots.utils.retriever_registry import retriever_registry
+from chatbots.utils.retrieval_cache import retrieval_cache
+from helpers.vector_index import ANN_METHODS, ann_index_name
+from services.logging_config import root_logger as logger
+
+load_dotenv()
+CONNECTION_STRING = os.getenv("DEV_DATABASE_URL")
+
+# Rows per embedding call + COPY batch; each batch is committed on its own
+BULK_EMBED_BATCH_SIZE = int(os.getenv("BULK_EMBED_BATCH_SIZE", 500))
+
+COPY_EMBEDDINGS_SQL = (
+    "COPY langchain_pg_embedding "
+    "(uuid, collection_id, embedding, document, cmetadata, custom_id) "
+    "FROM STDIN (FORMAT BINARY)"
+)
+COPY_EMBEDDINGS_TYPES = ["uuid", "uuid", "vector", "varchar", "json", "varchar"]
+
+# The named indexes on langchain_pg_embedding, with their definitions
+COLLECTION_INDEXES_SQL = """
+    SELECT i.relname, pg_get_indexdef(i.oid)
+    FROM pg_index x
+    JOIN pg_class i ON i.oid = x.indexrelid
+    WHERE x.indrelid = 'langchain_pg_embedding'::regclass
+      AND i.relname = ANY(%s)
+"""
+
+
+def iter_batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def chain_first(first, rest):
+    yield first
+    yield from rest
+
+
+def psycopg_dsn(connection_string):
+    """Strip any SQLAlchemy driver suffix (postgresql+psycopg2://) for psycopg."""
+    url = make_url(connection_string).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class BulkVectorWriter:
+    """
+    Writes documents and their embeddings straight into langchain_pg_embedding.
+
+    Rows are streamed with binary COPY in batches of `batch_size`. Each batch
+    is pulled from upstream and embedded before its transaction starts, and
+    committed right after its COPY, so no transaction stays open while a
+    lazy document stream crawls, parses or lemmatizes. With `defer_indexes`
+    the collection's own partial ANN indexes (see helpers/vector_index.py) are
+    dropped for the duration of the load and rebuilt once at the end. Indexes
+    shared with other collections are never touched.
+
+    Attributes:
+        embeddings: The embeddings function used to embed document text.
+        collection_name: The PGVector collection to write into.
+        connection_string: The database connection string.
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        collection_name,
+        connection_string=CONNECTION_STRING,
+        batch_size=BULK_EMBED_BATCH_SIZE,
+        defer_indexes=False,
+    ):
+        self.embeddings = embeddings
+        self.collection_name = collection_name
+        self.connection_string = connection_string
+        self.batch_size = batch_size
+        self.defer_indexes = defer_indexes
+
+    def write(self, documents, progress=None):
+        """
+        Embed and write `documents` to the collection.
+
+        Args:
+            documents (iterable): Documents with page_content and metadata. Any
+                iterable works; it is consumed one batch at a time.
+            progress (callable, optional): Called as progress(embedded=..., written=...)
+                with running totals after each batch is embedded and after it is written.
+
+        Returns:
+            int: The number of rows written.
+        """
+        batches = iter_batches(documents, self.batch_size)
+        first_batch = next(batches, None)
+        if first_batch is None:
+            return 0
+
+        written = 0
+        with psycopg.connect(psycopg_dsn(self.connection_string)) as connection:
+            register_vector(connection)
+            collection_id = self.get_or_create_collection(connection)
+            dropped_indexes = (
+                self._drop_collection_indexes(connection, collection_id) if self.defer_indexes else []
+            )
+
+            try:
+                for batch in chain_first(first_batch, batches):
+                    vectors = self.embeddings.embed_documents(
+                        [doc.page_content for doc in batch]
+                    )
+                    if progress:
+                        progress(embedded=written + len(batch), written=written)
+                    self._copy_batch(connection, collection_id, batch, vectors)
+                    connection.commit()
+                    written += len(batch)
+                    if progress:
+                        progress(embedded=written, written=written)
+            finally:
+                if dropped_indexes:
+                    connection.rollback()
+                    self._restore_indexes(connection, dropped_indexes)
+
+        retriever_registry.invalidate(self.collection_name)
+        retrieval_cache.invalidate(self.collection_name)
+        logger.info(f"Bulk wrote {written} embeddings to collection {self.collection_name}")
+        return written
+
+    def get_or_create_collection(self, connection):
+        row = connection.execute(
+            "SELECT uuid FROM langchain_pg_collection WHERE name = %s",
+            (self.collection_name,),
+        ).fetchone()
+        if row:
+            # End the lookup's transaction before the first batch is pulled from upstream
+            connection.commit()
+            return row[0]
+
+        collection_id = uuid.uuid4()
+        connection.execute(
+            "INSERT INTO langchain_pg_collection (uuid, name) VALUES (%s, %s)",
+            (collection_id, self.collection_name),
+        )
+        connection.commit()
+        logger.info(f"Created collection {self.collection_name} ({collection_id})")
+        return collection_id
+
+    def _copy_batch(self, connection, collection_id, documents, vectors):
+        with connection.cursor() as cursor:
+            with cursor.copy(COPY_EMBEDDINGS_SQL) as copy:
+                copy.set_types(COPY_EMBEDDINGS_TYPES)
+                for doc, vector in zip(documents, vectors):
+                    row_id = uuid.uuid4()
+                    # Incremental ingestion tracks rows by their deterministic chunk id
+                    custom_id = doc.metadata.get("chunk_id") or str(row_id)
+                    copy.write_row(
+                        (row_id, collection_id, vector, doc.page_content, doc.metadata, custom_id)
+                    )
+
+    def _drop_collection_indexes(self, connection, collection_id):
+        """Drop the collection's partial ANN indexes, returning their (name, definition) pairs."""
+        names = [ann_index_name(method, collection_id) for method in ANN_METHODS]
+        indexes = connection.execute(COLLECTION_INDEXES_SQL, (names,)).fetchall()
+        connection.commit()
+        # CONCURRENTLY can't run in a transaction; other collections keep writing meanwhile
+        connection.autocommit = True
+        try:
+            for name, _ in indexes:
+                connection.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+        finally:
+            connection.autocommit = False
+        if indexes:
+            logger.info(f"Deferred {len(indexes)} ANN indexes of collection {self.collection_name}")
+        return indexes
+
+    def _restore_indexes(self, connection, indexes):
+        connection.autocommit = True
+        try:
+            for name, definition in indexes:
+                logger.info(f"Rebuilding index {name}")
+                # IF NOT EXISTS: a concurrent job on the same collection may have rebuilt it already
+                connection.execute(
+                    definition.replace("CREATE INDEX ", "CREATE INDEX CONCURRENTLY IF NOT EXISTS ", 1)
+                )
+        finally:
+            connection.autocommit = False
@@ -0,0 +1,129 @@
+import os
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from langchain_core.embeddings import Embeddings
+from sqlalchemy.dialects.postgresql import insert
+from factory import db
+from models.users import EmbeddingCache
+from services.logging_config import root_logger as logger
+
+# Process-wide hit/miss counters for the embedding cache
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+# Query embeddings kept in memory, so repeated questions skip the embedding call
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 1024))
+_query_embeddings = OrderedDict()  # (model name, text hash) -> vector
+
+
+def normalize_text(text):
+    """Collapse whitespace so formatting-only changes map to the same cache key."""
+    return " ".join(text.split())
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def get_embedding_cache_stats():
+    """Return the hit/miss counters for the embedding cache."""
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+        "query_hits": _stats["query_hits"],
+        "query_misses": _stats["query_misses"],
+    }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves document embeddings from the embedding_cache table.
+
+    Texts are keyed by (model name, sha256 of normalized text). Cached vectors are
+    fetched in one bulk lookup and only the misses are sent to the wrapped backend.
+    Query embeddings are kept in a small in-process LRU keyed the same way.
+
+    Attributes:
+        embeddings: The wrapped embeddings backend (e.g. OpenAIEmbeddings).
+        model_name: The model name used to namespace the cache.
+    """
+
+    def __init__(self, embeddings, model_name):
+        self.embeddings = embeddings
+        self.model_name = model_name
+
+    def embed_documents(self, texts):
+        hashes = [text_hash(text) for text in texts]
+        cached = self._lookup(set(hashes))
+
+        # Embed each distinct missing text once
+        missing = {}
+        for text, key in zip(texts, hashes):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            new_entries = dict(zip(missing.keys(), vectors))
+            self._store(new_entries)
+            cached.update(new_entries)
+
+        hits = len(texts) - len(missing)
+        with _stats_lock:
+            _stats["hits"] += hits
+            _stats["misses"] += len(missing)
+        logger.info(
+            f"Embedding cache for {self.model_name}: {hits} hits, {len(missing)} misses"
+        )
+        return [cached[key] for key in hashes]
+
+    def embed_query(self, text):
+        key = (self.model_name, text_hash(text))
+        with _stats_lock:
+            vector = _query_embeddings.get(key)
+            if vector is not None:
+                _query_embeddings.move_to_end(key)
+                _stats["query_hits"] += 1
+                return list(vector)
+            _stats["query_misses"] += 1
+
+        vector = self.embeddings.embed_query(text)
+        with _stats_lock:
+            _query_embeddings[key] = vector
+            while len(_query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                _query_embeddings.popitem(last=False)
+        return list(vector)
+
+    def _lookup(self, hashes):
+        if not hashes:
+            return {}
+        rows = db.session.execute(
+            db.select(EmbeddingCache.text_hash, EmbeddingCache.embedding).where(
+                EmbeddingCache.model_name == self.model_name,
+                EmbeddingCache.text_hash.in_(hashes),
+            )
+        )
+        return {key: [float(value) for value in embedding] for key, embedding in rows}
+
+    def _store(self, entries):
+        statement = insert(EmbeddingCache).on_conflict_do_nothing(
+            index_elements=["model_name", "text_hash"]
+        )
+        try:
+            db.session.execute(
+                statement,
+                [
+                    {"model_name": self.model_name, "text_hash": key, "embedding": vector}
+                    for key, vector in entries.items()
+                ],
+            )
+            db.session.commit()
+        except Exception as e:
+            # A failed cache write should never fail the ingestion itself
+            db.session.rollback()
+            logger.error(f"Error storing embeddings in cache: {e}")
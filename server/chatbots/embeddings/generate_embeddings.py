@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.vectorstores.pgvector import PGVector
 import helpers.custom_exceptions as ce
+from chatbots.embeddings.embedding_cache import CachedEmbeddings
+from chatbots.embeddings.bulk_writer import BulkVectorWriter
 from services.logging_config import root_logger as logger
 
 load_dotenv()
@@ -10,28 +12,30 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 CONNECTION_STRING = os.getenv("DEV_DATABASE_URL")
 
 
-def generate_embeddings(embed_data, OPENAI_API_KEY, connection_string, collection_name):
+def generate_embeddings(embed_data, OPENAI_API_KEY, connection_string, collection_name, progress=None):
     try:
-        embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small", openai_api_key=OPENAI_API_KEY
+        embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(
+                model="text-embedding-3-small", openai_api_key=OPENAI_API_KEY
+            ),
+            model_name="text-embedding-3-small",
         )
 
-        logger.debug(f"Combined data: {embed_data[:5]}")
         vectorstore = PGVector(
             collection_name=collection_name,
             connection_string=connection_string,
             embedding_function=embeddings,
         )
-        logger.debug("Embedding generation completed")
-        logger.info(
-            f"Generated {len(embed_data)} embeddings to insert into PGVector: {collection_name}"
+        writer = BulkVectorWriter(
+            embeddings, collection_name, connection_string=connection_string
         )
+        written = writer.write(embed_data, progress=progress)
+        logger.info(f"Added {written} embeddings to PGVector: {collection_name}")
 
-        vectorstore.add_documents(embed_data)
-        logger.info(f"Embeddings added to the database")
-
-        return len(embed_data), vectorstore
+        return written, vectorstore
 
+    except ce.JobCancelledError:
+        raise
     except Exception as e:
         logger.error(f"Error generating embeddings or adding to the database: {e}")
         return 0
@@ -205,6 +205,5 @@ class ChatbotManager:
         
         # Manage message history
         chat_history = self.langchain_utility.get_chat_history(session_id)
-        chat_history.add_user_message(input_message)
-        chat_history.add_ai_message(response)
+        chat_history.add_exchange(input_message, response)
         return response
\ No newline at end of file
@@ -1,7 +1,7 @@
 import os
 import uuid
 from datetime import datetime, timedelta
-from langchain_community.chat_message_histories import PostgresChatMessageHistory
+from chatbots.utils.chat_history_store import PooledChatMessageHistory
 from dotenv import load_dotenv
 
 from models.chatbots import ConversationSession
@@ -32,10 +32,7 @@ class ConversationSessionManager:
             )
             hf.add_to_db(new_session)
             
-            chat_history = PostgresChatMessageHistory(
-                session_id=str(new_session.id),
-                connection_string=self.connection_string,
-            )
+            chat_history = PooledChatMessageHistory(new_session.id)
             return new_session, chat_history
         except Exception as e:
             logger.error(f"Error creating a new session for user {user_id} with chatbot {chatbot_id}: {e}")
@@ -122,10 +119,7 @@ class ConversationSessionManager:
     
     def add_message(self, session_id, message_content, is_user):
         try:
-            chat_history = PostgresChatMessageHistory(
-                session_id=str(session_id),
-                connection_string=self.connection_string,
-            )
+            chat_history = PooledChatMessageHistory(session_id)
             if is_user:
                 chat_history.add_user_message(message_content)
             else:
@@ -134,12 +128,17 @@ class ConversationSessionManager:
             logger.error(f"Error adding message to session {session_id}: {e}")
             raise ce.BadRequestError()
     
+    def add_exchange(self, session_id, user_message, ai_message):
+        try:
+            chat_history = PooledChatMessageHistory(session_id)
+            chat_history.add_exchange(user_message, ai_message)
+        except Exception as e:
+            logger.error(f"Error adding message exchange to session {session_id}: {e}")
+            raise ce.BadRequestError()
+    
     def get_messages(self, session_id):
         try:
-            chat_history = PostgresChatMessageHistory(
-                session_id=str(session_id),
-                connection_string=self.connection_string,
-            )
+            chat_history = PooledChatMessageHistory(session_id)
             messages = chat_history.get_messages()
             return messages
         except Exception as e:
@@ -148,10 +147,7 @@ class ConversationSessionManager:
         
     def get_chat_history(self, session_id):
         try:
-            chat_history = PostgresChatMessageHistory(
-                session_id=str(session_id),
-                connection_string=self.connection_string,
-            )
+            chat_history = PooledChatMessageHistory(session_id)
             return chat_history
         except Exception as e:
             logger.error(f"Error getting chat history for session {session_id}: {e}")
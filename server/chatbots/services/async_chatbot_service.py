@@ -0,0 +1,110 @@
+# chatbots/services/async_chatbot_service.py
+
+import asyncio
+import os
+from dotenv import load_dotenv
+from flask import current_app
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_openai import ChatOpenAI
+from chatbots.managers.session_manager import ConversationSessionManager
+from chatbots.utils.langchain_utility import LangchainUtility
+from utils.content_utils import get_or_create_conversation_session
+from services.logging_config import root_logger as logger
+
+load_dotenv()
+
+# Number of documents retrieved as context for each message
+ASYNC_CHAT_RETRIEVAL_K = int(os.getenv("ASYNC_CHAT_RETRIEVAL_K", 4))
+
+
+class AsyncChatbotService:
+    """
+    Asyncio counterpart of ChatbotService.
+
+    History loading and retrieval run concurrently, the LLM call is awaited, and
+    topic naming / description generation run as background tasks after the
+    answer is ready. Blocking database work is moved off the event loop with
+    asyncio.to_thread.
+
+    Attributes:
+        llm: The chat model (any LangChain chat model; injectable for tests).
+        session_manager: The conversation session manager.
+        langchain_utility: Provides the shared per-collection vector stores.
+    """
+
+    def __init__(self, llm=None):
+        self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        self.connection_string = os.getenv("DEV_DATABASE_URL")
+        self.llm = llm or ChatOpenAI(
+            model="gpt-4o",
+            temperature=0.3,
+            openai_api_key=self.openai_api_key,
+        )
+        self.session_manager = ConversationSessionManager(self.connection_string)
+        self.langchain_utility = LangchainUtility()
+        self._background_tasks = set()
+
+    async def handle_message(self, session_id, user_message, collection_name=None, user_id=None):
+        try:
+            chat_history, documents = await asyncio.gather(
+                asyncio.to_thread(self._load_history, session_id),
+                self._retrieve(user_message, collection_name),
+            )
+
+            prompt = self.generate_prompt(user_message, chat_history, documents)
+            response = await self.llm.ainvoke(prompt)
+
+            await asyncio.to_thread(
+                self.session_manager.add_exchange, session_id, user_message, response
+            )
+
+            if user_id:
+                self._run_in_background(
+                    get_or_create_conversation_session,
+                    user_id,
+                    user_message,
+                    response.content,
+                    collection_name,
+                )
+            return response
+        except Exception as e:
+            logger.error(f"Error handling async message: {e}")
+            raise
+
+    async def _retrieve(self, query, collection_name):
+        if not collection_name:
+            return []
+        vectorstore = await asyncio.to_thread(
+            self.langchain_utility.get_vectorstore, collection_name
+        )
+        retriever = vectorstore.as_retriever(search_kwargs={"k": ASYNC_CHAT_RETRIEVAL_K})
+        return await retriever.ainvoke(query)
+
+    def _load_history(self, session_id):
+        return self.session_manager.get_chat_history(session_id).messages
+
+    def _run_in_background(self, func, *args):
+        """Run blocking side work in a thread with its own app context, off the response path."""
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                return func(*args)
+
+        task = asyncio.ensure_future(asyncio.to_thread(run))
+        # Keep a reference so the task isn't garbage collected before it finishes
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def generate_prompt(self, user_message, chat_history, documents):
+        context = "\n\n".join(doc.page_content for doc in documents)
+        prompt_template = ChatPromptTemplate.from_messages([
+            ("system", "You are a helpful assistant. Use the following context to answer when it is relevant:\n\n{context}"),
+            MessagesPlaceholder(variable_name="chat_history"),
+            ("human", "{input}"),
+        ])
+        return prompt_template.format_messages(
+            context=context,
+            chat_history=chat_history,
+            input=user_message,
+        )
@@ -6,7 +6,9 @@ from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.chat_models import ChatOpenAI
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationSummaryMemory
-from langchain.vectorstores.pgvector import PGVector
+from chatbots.utils.retriever_registry import retriever_registry
+from chatbots.utils.retrieval_cache import CachedPGVector
+from chatbots.embeddings.embedding_cache import CachedEmbeddings
 
 load_dotenv()
 
@@ -14,13 +16,28 @@ class ChatRetrievalService:
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.connection_string = os.getenv("DEV_DATABASE_URL")
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small", openai_api_key=self.openai_api_key)
+        self.embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(model="text-embedding-3-small", openai_api_key=self.openai_api_key),
+            model_name="text-embedding-3-small",
+        )
         self.llm = ChatOpenAI(model="gpt-4o", temperature=0.3, openai_api_key=self.openai_api_key)
         self.memory = ConversationSummaryMemory(llm=self.llm, memory_key="chat_history", k=5, return_messages=True)
 
+    def get_vectorstore(self, collection_name):
+        return retriever_registry.get(
+            collection_name,
+            "vectorstore",
+            lambda: CachedPGVector.from_existing_collection(self.embeddings, collection_name, self.connection_string),
+        )
+
     def query_llm(self, query, chat_history, collection_name):
-        retriever = PGVector.from_existing_index(embedding=self.embeddings, collection_name=collection_name, connection_string=self.connection_string)
-        qa_retriever = ConversationalRetrievalChain.from_llm(llm=self.llm, retriever=retriever.as_retriever(), memory=self.memory)
+        qa_chain = retriever_registry.get(
+            collection_name,
+            "qa_chain",
+            lambda: ConversationalRetrievalChain.from_llm(llm=self.llm, retriever=self.get_vectorstore(collection_name).as_retriever()),
+        )
+        # The cached chain is shared, so attach this instance's memory to a shallow copy
+        qa_retriever = qa_chain.copy(update={"memory": self.memory})
         response = qa_retriever({"question": query, "chat_history": chat_history})
         return response
 
@@ -6,16 +6,16 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_openai import ChatOpenAI
 from chatbots.managers.session_manager import ConversationSessionManager
 from chatbots.managers.message_manager import ChatMessageManager
-from langchain_community.chat_message_histories import PostgresChatMessageHistory
 from services.logging_config import root_logger as logger
 
 load_dotenv()
 
 class ChatbotService:
-    def __init__(self):
+    def __init__(self, llm=None):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.connection_string = os.getenv("DEV_DATABASE_URL")
-        self.llm = ChatOpenAI(
+        # Any LangChain chat model can be injected, e.g. a fake model in tests
+        self.llm = llm or ChatOpenAI(
             model="gpt-4o",
             temperature=0.3,
             openai_api_key=self.openai_api_key,
@@ -46,15 +46,38 @@ class ChatbotService:
             # Get response from the LLM
             response = self.llm(prompt)
 
-            # Add user and AI messages to the chat history
-            self.message_manager.add_message(session_id, user_message, is_user=True)
-            self.message_manager.add_message(session_id, response, is_user=False)
+            # Add user and AI messages to the chat history in one transaction
+            self.session_manager.add_exchange(session_id, user_message, response)
 
             return response
         except Exception as e:
             logger.error(f"Error handling message: {e}")
             raise
 
+    def stream_message(self, session_id, user_message):
+        """
+        Stream the LLM answer to a user message token by token.
+
+        Yields the content of each chunk as it is generated. The user message
+        and the answer are added to the chat history once the stream closes.
+        """
+        chunks = []
+        try:
+            chat_history = self.get_chat_history(session_id)
+            prompt = self.generate_prompt(user_message, chat_history)
+
+            for chunk in self.llm.stream(prompt):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            logger.error(f"Error streaming message: {e}")
+            raise
+        finally:
+            # Persist whatever was generated, even if the client disconnected early
+            if chunks:
+                self.session_manager.add_exchange(session_id, user_message, "".join(chunks))
+
     def generate_prompt(self, user_message, chat_history):
         # Define basic PromptTemplate with placeholders for messages
         prompt_template = ChatPromptTemplate.from_messages([
@@ -65,9 +88,9 @@ class ChatbotService:
         ])
 
         # Use chat history and user message to fill the template
-        prompt = prompt_template.fill(
-            chat_history=chat_history,
+        prompt = prompt_template.format_messages(
+            chat_history=chat_history.messages,
             input=user_message,
-            agent_scratchpad=""
+            agent_scratchpad=[]
         )
         return prompt
\ No newline at end of file
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, message_to_dict, messages_from_dict
+from sqlalchemy import text
+from factory import db
+from services.logging_config import root_logger as logger
+
+# Number of most recent messages loaded per session
+CHAT_HISTORY_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", 20))
+
+# Same table layout as langchain's PostgresChatMessageHistory, so existing history is kept
+CREATE_MESSAGE_STORE_SQL = """
+    CREATE TABLE IF NOT EXISTS message_store (
+        id SERIAL PRIMARY KEY,
+        session_id TEXT NOT NULL,
+        message JSONB NOT NULL
+    )
+"""
+CREATE_MESSAGE_STORE_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS ix_message_store_session_id_id
+    ON message_store (session_id, id)
+"""
+
+_table_ready = False
+_table_lock = threading.Lock()
+
+
+def ensure_message_store():
+    """Create the message_store table and its (session_id, id) index once per process."""
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_lock:
+        if not _table_ready:
+            with db.engine.begin() as connection:
+                connection.execute(text(CREATE_MESSAGE_STORE_SQL))
+                connection.execute(text(CREATE_MESSAGE_STORE_INDEX_SQL))
+            _table_ready = True
+
+
+class PooledChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat message history for a session, stored in message_store.
+
+    Drop-in replacement for PostgresChatMessageHistory that borrows connections
+    from the SQLAlchemy engine's pool instead of opening a new psycopg connection
+    per instance. Reads return only the last `max_messages` messages.
+
+    Attributes:
+        session_id: The ID of the conversation session.
+        max_messages: The number of most recent messages to load.
+    """
+
+    def __init__(self, session_id, max_messages=CHAT_HISTORY_MAX_MESSAGES):
+        self.session_id = str(session_id)
+        self.max_messages = max_messages
+
+    @property
+    def messages(self):
+        return self.get_messages()
+
+    def get_messages(self, limit=None):
+        """
+        Retrieves the last `limit` messages of the session, oldest first.
+
+        Args:
+            limit (int, optional): Defaults to `max_messages`.
+
+        Returns:
+            list: A list of BaseMessage objects.
+        """
+        ensure_message_store()
+        with db.engine.connect() as connection:
+            rows = connection.execute(
+                text(
+                    "SELECT message FROM ("
+                    "  SELECT id, message FROM message_store"
+                    "  WHERE session_id = :session_id ORDER BY id DESC LIMIT :limit"
+                    ") recent ORDER BY id"
+                ),
+                {"session_id": self.session_id, "limit": limit or self.max_messages},
+            )
+            items = [row[0] for row in rows]
+        return messages_from_dict(items)
+
+    def add_message(self, message):
+        self.add_messages([message])
+
+    def add_messages(self, messages):
+        """Store several messages in a single transaction."""
+        ensure_message_store()
+        with db.engine.begin() as connection:
+            connection.execute(
+                text(
+                    "INSERT INTO message_store (session_id, message) "
+                    "VALUES (:session_id, CAST(:message AS JSONB))"
+                ),
+                [
+                    {"session_id": self.session_id, "message": json.dumps(message_to_dict(message))}
+                    for message in messages
+                ],
+            )
+
+    def add_exchange(self, user_message, ai_message):
+        """Store a user message and the AI reply together."""
+        if not isinstance(ai_message, BaseMessage):
+            ai_message = AIMessage(content=ai_message)
+        if not isinstance(user_message, BaseMessage):
+            user_message = HumanMessage(content=user_message)
+        self.add_messages([user_message, ai_message])
+        logger.debug(f"Stored message exchange for session {self.session_id}")
+
+    def clear(self):
+        ensure_message_store()
+        with db.engine.begin() as connection:
+            connection.execute(
+                text("DELETE FROM message_store WHERE session_id = :session_id"),
+                {"session_id": self.session_id},
+            )
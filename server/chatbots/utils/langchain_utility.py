@@ -4,12 +4,11 @@ from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.chat_models import ChatOpenAI
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationSummaryMemory
-from langchain.vectorstores.pgvector import PGVector
 from services.logging_config import root_logger as logger
-from content_loaders.process_urls import ingest_urls
-from content_loaders.process_pdfs import ingest_pdfs
-from content_loaders.process_youtube import ingest_videos
-from langchain_community.chat_message_histories import PostgresChatMessageHistory
+from chatbots.utils.chat_history_store import PooledChatMessageHistory
+from chatbots.embeddings.embedding_cache import CachedEmbeddings
+from chatbots.utils.retriever_registry import retriever_registry
+from chatbots.utils.retrieval_cache import CachedPGVector
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -18,8 +17,11 @@ CONNECTION_STRING = os.getenv("DEV_DATABASE_URL")
 class LangchainUtility:
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small", openai_api_key=self.openai_api_key
+        self.embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(
+                model="text-embedding-3-small", openai_api_key=self.openai_api_key
+            ),
+            model_name="text-embedding-3-small",
         )
         self.llm = ChatOpenAI(
             verbose=True,
@@ -34,64 +36,26 @@ class LangchainUtility:
             return_messages=True,
         )
     
-    def generate_embeddings(self, embed_data, collection_name):
-        try:
-            logger.debug(f"Combined data: {embed_data[:5]}")
-            vectorstore = PGVector(
-                collection_name=collection_name,
-                connection_string=CONNECTION_STRING,
-                embedding_function=self.embeddings,
-            )
-            logger.debug("Embedding generation completed")
-            logger.info(
-                f"Generated {len(embed_data)} embeddings to insert into PGVector: {collection_name}"
-            )
-
-            vectorstore.add_documents(embed_data)
-            logger.info(f"Embeddings added to the database")
-
-            return len(embed_data), vectorstore
-
-        except Exception as e:
-            logger.error(f"Error generating embeddings or adding to the database: {e}")
-            return 0
-    
-    def ingest_and_embed_content(self, content_type, content_data, collection_name):
-        processed_data = []
-        
-        if content_type == "url":
-            urls, url_title = content_data['urls'], content_data['url_title']
-            processed_data = ingest_urls(urls, url_title, collection_name)
-        elif content_type == "pdf":
-            processed_data = ingest_pdfs(content_data)
-        elif content_type == "videos":
-            processed_data = ingest_videos(content_data)
-        else:
-            logger.error(f"Unsupported content type: {content_type}")
-            raise ValueError(f"Unsupported content type: {content_type}")
-
-        if processed_data:
-            embeddings_count, vectorstore = self.generate_embeddings(
-                processed_data, collection_name
-            )
-            logger.info(f"Processed and stored {embeddings_count} embeddings.")
-            return processed_data
-        else:
-            logger.info("No data processed")
-            return processed_data
-
-    def llm_query(self, query, formatted_chat_history, collection_name):
-        retriever = PGVector.from_existing_index(
-            embedding=self.embeddings,
-            collection_name=collection_name,
-            connection_string=CONNECTION_STRING,
+    def get_vectorstore(self, collection_name):
+        return retriever_registry.get(
+            collection_name,
+            "vectorstore",
+            lambda: CachedPGVector.from_existing_collection(
+                self.embeddings, collection_name, CONNECTION_STRING
+            ),
         )
 
-        qa_retriever = ConversationalRetrievalChain.from_llm(
-            llm=self.llm,
-            retriever=retriever.as_retriever(),
-            memory=self.memory,
+    def llm_query(self, query, formatted_chat_history, collection_name):
+        qa_chain = retriever_registry.get(
+            collection_name,
+            "qa_chain",
+            lambda: ConversationalRetrievalChain.from_llm(
+                llm=self.llm,
+                retriever=self.get_vectorstore(collection_name).as_retriever(),
+            ),
         )
+        # The cached chain is shared, so attach this instance's memory to a shallow copy
+        qa_retriever = qa_chain.copy(update={"memory": self.memory})
 
         response = qa_retriever(
             {"question": query, "chat_history": formatted_chat_history}
@@ -99,10 +63,7 @@ class LangchainUtility:
         return response
     
     def get_chat_history(self, session_id):
-        chat_history = PostgresChatMessageHistory(
-            session_id=str(session_id),
-            connection_string=CONNECTION_STRING,
-        )
+        chat_history = PooledChatMessageHistory(session_id)
         return chat_history
 
     @staticmethod
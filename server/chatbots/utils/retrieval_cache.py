@@ -0,0 +1,221 @@
+import os
+import sys
+import time
+import hashlib
+import threading
+import contextvars
+from collections import OrderedDict, Counter
+import numpy as np
+from sqlalchemy import event
+from langchain.vectorstores.pgvector import PGVector
+from helpers.vector_index import require_collection, set_vector_search_params, default_search_params
+from services.logging_config import root_logger as logger
+
+RETRIEVAL_CACHE_ENABLED = os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true"
+RETRIEVAL_CACHE_TTL = int(os.getenv("RETRIEVAL_CACHE_TTL", 300))  # Seconds a result stays fresh
+RETRIEVAL_CACHE_MAX_MB = int(os.getenv("RETRIEVAL_CACHE_MAX_MB", 64))  # Estimated size of cached results
+# Decimals kept of the unit-normalized embedding, so float noise maps to the same key
+RETRIEVAL_CACHE_PRECISION = int(os.getenv("RETRIEVAL_CACHE_PRECISION", 4))
+
+# Rough per-entry and per-document overhead of the Python objects held
+ENTRY_OVERHEAD_BYTES = 256
+DOCUMENT_OVERHEAD_BYTES = 512
+
+# ANN settings of the search running in the current context, applied when its transaction begins
+_active_search_params = contextvars.ContextVar("active_search_params", default=None)
+
+
+def embedding_key(embedding, precision=RETRIEVAL_CACHE_PRECISION):
+    """sha256 of the unit-normalized embedding rounded to `precision` decimals."""
+    vector = np.asarray(embedding, dtype=np.float64)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector = vector / norm
+    return hashlib.sha256(np.round(vector, precision).astype(np.float32).tobytes()).hexdigest()
+
+
+def estimate_size(results):
+    size = ENTRY_OVERHEAD_BYTES
+    for doc, _ in results:
+        size += DOCUMENT_OVERHEAD_BYTES + sys.getsizeof(doc.page_content)
+        size += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in doc.metadata.items())
+    return size
+
+
+class RetrievalCache:
+    """
+    Process-wide LRU cache of similarity search results, bounded in bytes.
+
+    Results are keyed by (collection, normalized query embedding hash, k,
+    search settings) and expire after `ttl` seconds. The least recently used results are evicted
+    once their estimated size exceeds `max_bytes`. Writers call `invalidate`
+    after changing a collection; like the retriever registry, invalidation is
+    local to the current process and the TTL bounds staleness elsewhere.
+
+    Attributes:
+        ttl: Seconds a cached result is served.
+        max_bytes: Size limit of the cached results.
+    """
+
+    def __init__(self, ttl=RETRIEVAL_CACHE_TTL, max_mb=RETRIEVAL_CACHE_MAX_MB):
+        self.ttl = ttl
+        self.max_bytes = max_mb * 1024 * 1024
+        self._entries = OrderedDict()  # key -> (expires_at, size, search_seconds, results)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = Counter()
+
+    def get(self, collection_name, embedding, k, variant=()):
+        """
+        Return cached (document, score) pairs, or None on a miss.
+
+        `variant` holds anything else that changes the results, e.g. ANN search settings.
+        """
+        key = (collection_name, embedding_key(embedding), k, variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats["seconds_saved"] += entry[2]
+            return entry[3]
+
+    def put(self, collection_name, embedding, k, results, search_seconds, variant=()):
+        key = (collection_name, embedding_key(embedding), k, variant)
+        size = estimate_size(results)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, search_seconds, results)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evicted"] += 1
+
+    def _remove(self, key):
+        self._bytes -= self._entries.pop(key)[1]
+
+    def invalidate(self, collection_name):
+        """Drop every cached result for a collection, e.g. after it has been re-ingested."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == collection_name]
+            for key in keys:
+                self._remove(key)
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached retrievals for collection {collection_name}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self._stats["hits"], self._stats["misses"]
+            total = hits + misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / total if total else 0.0,
+                "latency_saved_seconds": round(self._stats["seconds_saved"], 3),
+                "expired": self._stats["expired"],
+                "evicted": self._stats["evicted"],
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+retrieval_cache = RetrievalCache()
+
+
+def get_retrieval_cache_stats():
+    return retrieval_cache.stats()
+
+
+class CachedPGVector(PGVector):
+    """
+    PGVector whose unfiltered similarity searches are served from the retrieval cache.
+
+    Every similarity search path (retrievers, similarity_search, the async
+    variants) goes through similarity_search_with_score_by_vector, so the cache
+    sits there. On a miss the search time is recorded, and each later hit adds
+    it to the latency saved.
+
+    `search_params` (ef_search, probes) trade recall for latency. The store's
+    defaults are applied with SET LOCAL to every transaction it begins, and a
+    single search can override them, e.g. through a retriever's
+    search_kwargs={"search_params": {"ef_search": 200}}.
+    """
+
+    def __init__(self, *args, search_params=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.search_params = default_search_params() if search_params is None else dict(search_params)
+        event.listen(self._bind, "begin", self._apply_search_params)
+
+    def _apply_search_params(self, connection):
+        params = _active_search_params.get()
+        set_vector_search_params(connection, **(self.search_params if params is None else params))
+
+    @classmethod
+    def from_existing_collection(cls, embedding_function, collection_name, connection_string, search_params=None):
+        """
+        Open a collection for search, raising ResourceNotFoundError if it doesn't exist.
+
+        The PGVector constructor creates missing collections, so a chat against
+        a mistyped name would otherwise leave an empty collection behind.
+        """
+        require_collection(connection_string, collection_name)
+        return cls(
+            embedding_function=embedding_function,
+            collection_name=collection_name,
+            connection_string=connection_string,
+            pre_delete_collection=False,
+            search_params=search_params,
+        )
+
+    def similarity_search(self, query, k=4, filter=None, search_params=None, **kwargs):
+        # PGVector drops extra kwargs here, so search_params is threaded through explicitly
+        embedding = self.embedding_function.embed_query(query)
+        return [
+            doc
+            for doc, _ in self.similarity_search_with_score_by_vector(
+                embedding, k=k, filter=filter, search_params=search_params
+            )
+        ]
+
+    def similarity_search_with_score(self, query, k=4, filter=None, search_params=None):
+        embedding = self.embedding_function.embed_query(query)
+        return self.similarity_search_with_score_by_vector(
+            embedding, k=k, filter=filter, search_params=search_params
+        )
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, filter=None, search_params=None):
+        params = {**self.search_params, **(search_params or {})}
+        token = _active_search_params.set(params)
+        try:
+            return self._cached_search(embedding, k, filter, tuple(sorted(params.items())))
+        finally:
+            _active_search_params.reset(token)
+
+    def _cached_search(self, embedding, k, filter, variant):
+        if not RETRIEVAL_CACHE_ENABLED or filter is not None:
+            return super().similarity_search_with_score_by_vector(embedding, k=k, filter=filter)
+
+        cached = retrieval_cache.get(self.collection_name, embedding, k, variant)
+        if cached is not None:
+            return [(doc.copy(deep=True), score) for doc, score in cached]
+
+        started = time.perf_counter()
+        results = super().similarity_search_with_score_by_vector(embedding, k=k, filter=filter)
+        retrieval_cache.put(
+            self.collection_name, embedding, k, results, time.perf_counter() - started, variant
+        )
+        return [(doc.copy(deep=True), score) for doc, score in results]
@@ -0,0 +1,62 @@
+import os
+import threading
+from collections import OrderedDict
+from services.logging_config import root_logger as logger
+
+RETRIEVER_REGISTRY_SIZE = int(os.getenv("RETRIEVER_REGISTRY_SIZE", 32))
+
+
+class RetrieverRegistry:
+    """
+    Process-wide LRU registry of warmed vector stores and chains, keyed by collection.
+
+    Entries are built on first use with the factory passed to `get` and reused by
+    every later request. The least recently used entry is evicted once `max_size`
+    entries are held. Writers call `invalidate` after re-ingesting a collection;
+    invalidation is local to the current process.
+
+    Attributes:
+        max_size: The maximum number of entries held.
+    """
+
+    def __init__(self, max_size=RETRIEVER_REGISTRY_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, collection_name, kind, factory):
+        """
+        Return the `kind` entry (e.g. "vectorstore", "qa_chain") for a collection,
+        building it with `factory()` on a miss.
+        """
+        key = (collection_name, kind)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        # Build outside the lock so a slow warm-up doesn't block other collections
+        entry = factory()
+
+        with self._lock:
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            logger.debug(f"Warmed {kind} for collection {collection_name}")
+            while len(self._entries) > self.max_size:
+                evicted_key, _ = self._entries.popitem(last=False)
+                logger.debug(f"Evicted {evicted_key[1]} for collection {evicted_key[0]}")
+            return entry
+
+    def invalidate(self, collection_name):
+        """Drop every entry for a collection, e.g. after it has been re-ingested."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == collection_name]:
+                del self._entries[key]
+        logger.info(f"Invalidated cached retrievers for collection {collection_name}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+retriever_registry = RetrieverRegistry()
@@ -0,0 +1,46 @@
+import sys
+
+
+class Document:
+    """
+    A processed chunk shared by the content loaders.
+
+    Instances use __slots__ instead of a per-instance __dict__, metadata keys
+    are interned so every chunk's metadata shares the same key strings, and
+    lemmatized text equal to the content is not stored separately.
+    """
+
+    __slots__ = ("page_content", "metadata", "_lemmatized_text")
+
+    def __init__(self, content, metadata=None, lemmatized_text=None):
+        self.page_content = content
+        self.metadata = (
+            {sys.intern(key): value for key, value in metadata.items()} if metadata else {"title": ""}
+        )
+        # None means the lemmatized text is the content itself
+        self._lemmatized_text = (
+            None if not lemmatized_text or lemmatized_text == content else lemmatized_text
+        )
+
+    @property
+    def lemmatized_text(self):
+        return self.page_content if self._lemmatized_text is None else self._lemmatized_text
+
+    @lemmatized_text.setter
+    def lemmatized_text(self, value):
+        self._lemmatized_text = None if value == self.page_content else value
+
+    @property
+    def title(self):
+        return self.metadata.get("title", "No Title")
+
+    def to_dict(self):
+        page_content = self.page_content
+        return {
+            "page_content": page_content,
+            "metadata": self.metadata,
+            "lemmatized_text": page_content if self._lemmatized_text is None else self._lemmatized_text,
+        }
+
+    def __repr__(self):
+        return f"Document(page_content={self.page_content[:50]!r}, metadata={self.metadata!r})"
@@ -0,0 +1,108 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pdfplumber
+from langchain_core.documents import Document as LangchainDocument
+from helpers.file_cache import read_json_gz, write_json_gz
+from helpers.process_pools import pool_context
+from services.logging_config import root_logger as logger
+
+# Worker processes for page extraction, and pages per task. Half the cores by default,
+# since the NLP pool lemmatizes the extracted pages at the same time.
+PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", max(1, (os.cpu_count() or 1) // 2)))
+PDF_SHARD_PAGES = int(os.getenv("PDF_SHARD_PAGES", 16))
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join(os.getcwd(), "pdf_cache"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_pool():
+    """Return the shared extraction pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_PROCESS_WORKERS, mp_context=pool_context())
+            logger.info(f"Started PDF extraction pool with {PDF_PROCESS_WORKERS} workers")
+        return _pool
+
+
+def _extract_page_range(file_path, start, end):
+    """Extract the text of pages [start, end) of a PDF, as (page number, text) pairs."""
+    with pdfplumber.open(file_path) as pdf:
+        # Trailing newline as in Langchain's PDFPlumberParser, so chunk boundaries don't change
+        return [
+            (number, (pdf.pages[number].extract_text() or "") + "\n") for number in range(start, end)
+        ]
+
+
+def pdf_cache_key(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return f"{digest.hexdigest()}_{os.stat(file_path).st_mtime_ns}"
+
+
+def pages_cache_path(cache_key):
+    return os.path.join(PDF_CACHE_DIR, f"{cache_key}.json.gz")
+
+
+def page_document(file_path, number, total_pages, text):
+    return LangchainDocument(
+        page_content=text,
+        metadata={"source": file_path, "file_path": file_path, "page": number, "total_pages": total_pages},
+    )
+
+
+def iter_page_texts(file_path, total_pages, shard_pages=PDF_SHARD_PAGES):
+    """Yield (page number, text) in page order, extracting shards of pages on the process pool"""
+    if PDF_PROCESS_WORKERS <= 1 or total_pages <= shard_pages:
+        yield from _extract_page_range(file_path, 0, total_pages)
+        return
+
+    futures = {
+        get_pdf_pool().submit(
+            _extract_page_range, file_path, start, min(start + shard_pages, total_pages)
+        ): start
+        for start in range(0, total_pages, shard_pages)
+    }
+    finished = {}  # shard start -> pages, held until every earlier shard has finished
+    next_start = 0
+    try:
+        for future in as_completed(futures):
+            finished[futures[future]] = future.result()
+            while next_start in finished:
+                yield from finished.pop(next_start)
+                next_start += shard_pages
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def iter_pdf_pages(file_path, shard_pages=PDF_SHARD_PAGES):
+    """
+    Yield the pages of a local PDF as documents, in order, as soon as they are extracted.
+
+    Pages are extracted in shards of `shard_pages` on a process pool. The text
+    of every page is cached on disk, keyed by the file's sha256 and mtime, so
+    an unchanged file is not parsed again.
+    """
+    cache_key = pdf_cache_key(file_path)
+    texts = read_json_gz(pages_cache_path(cache_key))
+    if texts is not None:
+        logger.debug(f"Using cached text of {len(texts)} pages for {file_path}")
+        for number, text in enumerate(texts):
+            yield page_document(file_path, number, len(texts), text)
+        return
+
+    with pdfplumber.open(file_path) as pdf:
+        total_pages = len(pdf.pages)
+
+    texts = []
+    for number, text in iter_page_texts(file_path, total_pages, shard_pages):
+        texts.append(text)
+        yield page_document(file_path, number, total_pages, text)
+    write_json_gz(pages_cache_path(cache_key), texts)
+    logger.info(f"Extracted {total_pages} pages from {file_path}")
@@ -1,61 +1,61 @@
 import os
 import requests
 from pprint import pprint
-import spacy
 import PyPDF2
 from langchain.document_loaders import PDFPlumberLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from content_loaders.document import Document
+from content_loaders.text_splitter import text_splitter
+from content_loaders.pdf_extraction import iter_pdf_pages
 from metadata.transformers import *
+from factory.nlp_factory import get_nlp
+from metadata.nlp_pool import iter_clean_and_lemmatize
 from dotenv import load_dotenv
 from services.logging_config import root_logger as logger
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-nlp = spacy.load("en_core_web_sm")
 
 
-class Document:
-    def __init__(self, content, metadata=None, lemmatized_text=None):
-        self.page_content = content
-        self.metadata = metadata or {"title": ""}
-        self.lemmatized_text = lemmatized_text or content
-
-    @property
-    def title(self):
-        return self.metadata.get("title", "No Title")
-
-
-def ingest_pdfs(batch_pdfs, pdf_title, collection_name):
-    """Process and ingest PDF documents"""
-
-    processed_pdfs = []
+def load_pdf_documents(batch_pdfs, splitter=text_splitter):
+    """Yield (file_path, chunk) pairs, splitting each page as soon as it is extracted"""
     for file_path in batch_pdfs:
         try:
-            loader = PDFPlumberLoader(
-                file_path=file_path,
-            )
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000, chunk_overlap=200
-            )
-            pdf_list = loader.load_and_split(text_splitter)
-            for pdf in pdf_list:
-                processed_pdf = process_pdfs(
-                    pdf, nlp, pdf.metadata, pdf_title, collection_name
-                )
-                processed_pdfs.append(processed_pdf)
+            if os.path.isfile(file_path):
+                pages = iter_pdf_pages(file_path)
+            else:
+                # Remote PDFs are downloaded and parsed by Langchain's loader
+                pages = PDFPlumberLoader(file_path=file_path).lazy_load()
+            for page in pages:
+                for pdf in splitter.split_documents([page]):
+                    yield file_path, pdf
 
         except requests.RequestException as e:
             pprint(f"Failed to fetch PDF from URL: {file_path}. Error: {e}")
             logger.error(f"Failed to fetch PDF from URL: {file_path}. Error: {e}")
 
-    return processed_pdfs
 
+def iter_pdf_documents(batch_pdfs, pdf_title, collection_name):
+    """Yield processed PDF chunks as they are loaded and lemmatized"""
+    for (file_path, pdf), lemmatized_text in iter_clean_and_lemmatize(
+        load_pdf_documents(batch_pdfs), text=lambda item: item[1].page_content
+    ):
+        processed_pdf = process_pdfs(
+            pdf, None, pdf.metadata, pdf_title, collection_name, lemmatized_text
+        )
+        processed_pdf.metadata["source"] = file_path
+        yield processed_pdf
+
+
+def ingest_pdfs(batch_pdfs, pdf_title, collection_name):
+    """Process and ingest PDF documents"""
+    return list(iter_pdf_documents(batch_pdfs, pdf_title, collection_name))
 
-def process_pdfs(pdf, nlp, metadata, pdf_title, collection_name):
-    """Process individual PDF for metadata, content, and embeddings"""
-    cleaned_text = clean_text(pdf.page_content)
 
-    lemmatized_text = lemmatize_text(cleaned_text, nlp)
+def process_pdfs(pdf, nlp, metadata, pdf_title, collection_name, lemmatized_text=None):
+    """Process individual PDF for metadata, content, and embeddings"""
+    if lemmatized_text is None:
+        cleaned_text = clean_text(pdf.page_content)
+        lemmatized_text = lemmatize_text(cleaned_text, nlp or get_nlp("lemmatizer"))
     title = metadata.get("title", "No Title")
     if title == "No Title":
         title = f"{pdf_title}, PDFs"
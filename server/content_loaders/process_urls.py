@@ -1,30 +1,40 @@
 import os
+import time
 import requests
 import subprocess
 import json
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
 
 from pprint import pprint
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup as Soup
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-
-from langchain.document_loaders.recursive_url_loader import RecursiveUrlLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document as LangchainDocument
+from langchain_core.utils.html import extract_sub_links
+from content_loaders.document import Document
+from content_loaders.text_splitter import text_splitter
 from retrying import retry
-import spacy
 import warnings
 
 from metadata.extractors import *
 from metadata.transformers import *
+from factory.nlp_factory import get_nlp
+from metadata.nlp_pool import iter_clean_and_lemmatize
+from services.browser_pool import get_browser_pool
+from services.http_cache import cached_get
+from services.source_manifest import INCOMPLETE_SOURCE
 from services.logging_config import root_logger as logger
 
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-nlp = spacy.load("en_core_web_sm")
+
+# Concurrency limits for URL ingestion
+URL_INGEST_WORKERS = int(os.getenv("URL_INGEST_WORKERS", 8))  # Global in-flight cap
+URL_INGEST_PER_HOST = int(os.getenv("URL_INGEST_PER_HOST", 2))  # Concurrent crawls per host
+URL_INGEST_DEADLINE = int(os.getenv("URL_INGEST_DEADLINE", 300))  # Seconds per URL
 
 # Suppress only the specific warning from BeautifulSoup
 warnings.filterwarnings("ignore", category=Warning)
@@ -33,91 +43,193 @@ warnings.filterwarnings("ignore", category=Warning)
 @retry(stop_max_attempt_number=3, wait_fixed=3000)
 def fetch_url(url):
     """Fetch content from a URL with retries"""
-    response = requests.get(url, timeout=60)
+    response = cached_get(url, timeout=60)
     response.raise_for_status()
     return response.text
 
 
-class Document:
-    def __init__(self, content, metadata=None, lemmatized_text=None):
-        self.page_content = content
-        self.metadata = metadata or {"title": ""}
-        self.lemmatized_text = lemmatized_text or content
+def is_transient_failure(response):
+    return response.status_code >= 500 or response.status_code == 429
 
-    @property
-    def title(self):
-        return self.metadata.get("title", "No Title")
-    
-    def to_dict(self):
-        return {
-            "page_content": self.page_content,
-            "metadata": self.metadata,
-            "lemmatized_text": self.lemmatized_text,
-        }
 
+def crawl_site(url, max_depth=3, timeout=60, failed_pages=None):
+    """Yield (page_url, html) for a URL and the pages below it, fetched through the HTTP cache
 
+    Follows the same rules as Langchain's RecursiveUrlLoader: links outside
+    `url` are ignored, pages deeper than `max_depth` are not fetched and
+    failed pages are logged and skipped. Pages that failed to load (errors,
+    5xx or 429) are appended to `failed_pages`, so callers can tell an
+    incomplete crawl from pages that were removed.
+    """
+    visited = set()
 
-def scrape_with_selenium(url):
-    """Scrape content using Selenium"""
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
-    driver.get(url)
-    content = driver.page_source
-    driver.quit()
-    return content
-    
-
-def ingest_urls(batch_urls, url_title, collection_name):
-    """Process and ingest documents from URLs"""
-    
-    processed_documents = []
-    
-    for url in batch_urls:
+    def visit(page_url, depth):
+        if depth >= max_depth:
+            return
+        visited.add(page_url)
         try:
-            # Try Langchain Loader
-            loader = RecursiveUrlLoader(
-                url=url,
-                max_depth=3,
-                timeout=60,
-                extractor=lambda x: Soup(x, "html.parser").text,
-            )
+            response = cached_get(page_url, timeout=timeout)
+            if is_transient_failure(response):
+                raise requests.HTTPError(f"{response.status_code} response", response=response)
+        except Exception as e:
+            logger.warning(f"Unable to load from {page_url}. Received error {e} of type {e.__class__.__name__}")
+            if failed_pages is not None:
+                failed_pages.append(page_url)
+            return
+        yield page_url, response.text
+        sub_links = extract_sub_links(
+            response.text, page_url, base_url=url, prevent_outside=True, continue_on_failure=True
+        )
+        for link in sub_links:
+            if link not in visited:
+                yield from visit(link, depth + 1)
+
+    yield from visit(url, 0)
 
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000, chunk_overlap=200
+
+def scrape_with_selenium(url):
+    """Scrape content using a pooled headless browser"""
+    return get_browser_pool().fetch(url)
+
+
+def load_url_documents(url, url_title, splitter=text_splitter):
+    """Crawl a single URL and split it into documents, falling back to Selenium
+
+    Documents of a crawl that missed pages carry metadata[INCOMPLETE_SOURCE],
+    so incremental ingestion doesn't delete the chunks of the missed pages.
+    """
+    try:
+        # Crawl through the HTTP cache, so unchanged pages cost a 304
+        documents = []
+        failed_pages = []
+        for page_url, html in crawl_site(url, max_depth=3, timeout=60, failed_pages=failed_pages):
+            content = Soup(html, "html.parser").text
+            if content:
+                documents.append(LangchainDocument(page_content=content, metadata={"source": page_url}))
+
+        chunks = splitter.split_documents(documents)
+        if failed_pages:
+            logger.warning(f"Crawl of {url} missed {len(failed_pages)} pages: {failed_pages[:5]}")
+            for chunk in chunks:
+                chunk.metadata[INCOMPLETE_SOURCE] = True
+        return chunks
+
+    except Exception as e:
+        logger.warning(f"Crawl failed for URL {url}: {e}. Falling back to Selenium")
+
+        # Fall back to Selenium if Langchain fails; it only loads the page itself
+        page_content = scrape_with_selenium(url)
+        return [Document(content=page_content, metadata={"title": url_title, INCOMPLETE_SOURCE: True})]
+
+
+def crawl_urls(
+    batch_urls,
+    url_title,
+    max_workers=URL_INGEST_WORKERS,
+    per_host=URL_INGEST_PER_HOST,
+    deadline=URL_INGEST_DEADLINE,
+):
+    """Crawl URLs concurrently, yielding (url, documents) in the order of `batch_urls`
+
+    URLs are crawled on a bounded thread pool. At most `max_workers` crawls are
+    in flight, at most `per_host` of them against the same host, and a crawl
+    still running after `deadline` seconds is abandoned with no documents.
+    A URL is yielded as soon as it and every URL before it have finished.
+    """
+    pending = deque(batch_urls)
+    in_flight = {}  # future -> (url, host, started_at)
+    abandoned = set()  # Timed-out futures still holding a worker thread
+    host_counts = Counter()
+    finished = {}  # url -> documents, held until every earlier URL has finished
+    next_index = 0
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while pending or in_flight:
+            # Fill free worker slots, skipping hosts already at their limit
+            abandoned = {future for future in abandoned if not future.done()}
+            deferred = deque()
+            while pending and len(in_flight) + len(abandoned) < max_workers:
+                url = pending.popleft()
+                host = urlparse(url).netloc
+                if host_counts[host] >= per_host:
+                    deferred.append(url)
+                    continue
+                host_counts[host] += 1
+                future = executor.submit(load_url_documents, url, url_title)
+                in_flight[future] = (url, host, time.monotonic())
+            deferred.extend(pending)
+            pending = deferred
+
+            if not in_flight:
+                # Every worker is held by an abandoned crawl; wait for one to free up
+                wait(abandoned, return_when=FIRST_COMPLETED)
+                continue
+
+            next_deadline = min(started for _, _, started in in_flight.values()) + deadline
+            done, _ = wait(
+                in_flight,
+                timeout=max(next_deadline - time.monotonic(), 0),
+                return_when=FIRST_COMPLETED,
             )
-            docs_list = loader.load_and_split(text_splitter)
 
-            for doc in docs_list:
-                processed_doc = process_urls(
-                    doc, nlp, doc.metadata, url_title, collection_name
-                )
-                processed_documents.append(processed_doc)
+            now = time.monotonic()
+            for future in list(in_flight):
+                url, host, started = in_flight[future]
+                if future in done:
+                    try:
+                        finished[url] = future.result()
+                    except Exception as e:
+                        logger.error(f"Both Langchain and Selenium failed for URL {url}: {e}")
+                        finished[url] = []
+                elif now - started >= deadline:
+                    logger.error(f"Ingestion of URL {url} exceeded {deadline}s deadline, skipping")
+                    abandoned.add(future)
+                    finished[url] = []
+                else:
+                    continue
+                del in_flight[future]
+                host_counts[host] -= 1
+
+            while next_index < len(batch_urls) and batch_urls[next_index] in finished:
+                url = batch_urls[next_index]
+                next_index += 1
+                yield url, finished.pop(url)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_url_documents(batch_urls, url_title, collection_name, **crawl_options):
+    """Yield processed documents from URLs as they are crawled and lemmatized"""
+    batch_urls = list(batch_urls)
+    sourced_docs = (
+        (url, doc)
+        for url, docs in crawl_urls(batch_urls, url_title, **crawl_options)
+        for doc in docs
+    )
+    for (url, doc), lemmatized_text in iter_clean_and_lemmatize(
+        sourced_docs, text=lambda item: item[1].page_content
+    ):
+        processed_doc = process_urls(
+            doc, None, doc.metadata, url_title, collection_name, lemmatized_text
+        )
+        processed_doc.metadata["source"] = url
+        if doc.metadata.get(INCOMPLETE_SOURCE):
+            processed_doc.metadata[INCOMPLETE_SOURCE] = True
+        yield processed_doc
+
+
+def ingest_urls(batch_urls, url_title, collection_name, **crawl_options):
+    """Process and ingest documents from URLs"""
+    return list(iter_url_documents(batch_urls, url_title, collection_name, **crawl_options))
+
 
-        except Exception as e:
-            logger.warning(f"Langchain failed for URL {url}: {e}. Falling back to Selenium")    
-            
-            # Fall back to Selenium if Langchain fails
-            try:
-                page_content = scrape_with_selenium(url)
-                doc = Document(content=page_content, metadata={"title": url_title})
-                processed_doc = process_urls(
-                    doc, nlp, doc.metadata, url_title, collection_name
-                )
-                processed_documents.append(processed_doc)
-            except Exception as se:
-                logger.error(f"Both Langchain and Selenium failed for URL {url}: {se}")
-
-    return processed_documents
-
-
-def process_urls(doc, nlp, metadata, url_title, collection_name):
+def process_urls(doc, nlp, metadata, url_title, collection_name, lemmatized_text=None):
     """Process individual document for metadata, content, and embeddings"""
     # Process each document and add to processed_docs
-    cleaned_text = clean_text(doc.page_content)
-    lemmatized_text = lemmatize_text(cleaned_text, nlp)
+    if lemmatized_text is None:
+        cleaned_text = clean_text(doc.page_content)
+        lemmatized_text = lemmatize_text(cleaned_text, nlp or get_nlp("lemmatizer"))
     title = metadata.get("title", "No Title")
     if title == "No Title":
         title = f"{url_title} Web"
@@ -1,70 +1,125 @@
 import os
-import requests
-import spacy
-import time  # Import the time module
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
 from dotenv import load_dotenv
 from langchain.document_loaders import YoutubeLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from content_loaders.document import Document
+from content_loaders.text_splitter import text_splitter
+from langchain_core.documents import Document as LangchainDocument
+from helpers.rate_limiter import TokenBucket
+from helpers.file_cache import read_json_gz, write_json_gz
 from metadata.transformers import *
+from factory.nlp_factory import get_nlp
+from metadata.nlp_pool import iter_clean_and_lemmatize
 from services.logging_config import root_logger as logger
 
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-nlp = spacy.load("en_core_web_sm")
 
 # Define the rate limit parameters
-MAX_REQUESTS_PER_SECOND = 5  # Maximum requests per second
-MIN_REQUEST_INTERVAL = 1 / MAX_REQUESTS_PER_SECOND  # Minimum time between requests
+MAX_REQUESTS_PER_SECOND = float(os.getenv("YOUTUBE_MAX_REQUESTS_PER_SECOND", 5))  # Maximum requests per second
+YOUTUBE_FETCH_WORKERS = int(os.getenv("YOUTUBE_FETCH_WORKERS", 8))  # Concurrent transcript fetches
+YOUTUBE_MAX_RETRIES = int(os.getenv("YOUTUBE_MAX_RETRIES", 3))  # Retries after a 429
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", os.path.join(os.getcwd(), "transcript_cache"))
 
+# Shared by every ingestion so concurrent jobs stay under the limit together
+rate_limiter = TokenBucket(MAX_REQUESTS_PER_SECOND)
 
-class Document:
-    def __init__(self, content, metadata=None, lemmatized_text=None):
-        self.page_content = content
-        self.metadata = metadata or {"title": ""}
-        self.lemmatized_text = lemmatized_text or content
 
-    @property
-    def title(self):
-        return self.metadata.get("title", "No Title")
+def transcript_cache_path(video_id):
+    return os.path.join(TRANSCRIPT_CACHE_DIR, f"{video_id}.json.gz")
 
 
-def ingest_videos(batch_videos, video_title, collection_name):
-    """Process and ingest YouTube videos"""
-    processed_videos = []
-    api_key = os.getenv("YOUTUBE_API_KEY")
+def read_cached_transcript(video_id):
+    documents = read_json_gz(transcript_cache_path(video_id))
+    # Empty transcripts were never meant to be cached; treat them as a miss
+    if not documents:
+        return None
+    return [LangchainDocument(**doc) for doc in documents]
+
+
+def write_cached_transcript(video_id, documents):
+    write_json_gz(
+        transcript_cache_path(video_id),
+        [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents],
+        default=str,
+    )
+
+
+def is_rate_limited(error):
+    message = str(error)
+    return "429" in message or "Too Many Requests" in message
 
-    for url in batch_videos:
-        try:
-            loader = YoutubeLoader.from_youtube_url(
-                url,
-                add_video_info=True,
-            )
-            video = loader.load_and_split()
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000, chunk_overlap=200
-            )
-            youtube_list = loader.load_and_split(text_splitter)
-
-            for video in youtube_list:
-                processed_video = process_videos(
-                    video, nlp, video.metadata, video_title, collection_name
-                )
-                processed_videos.append(processed_video)
-            time.sleep(MIN_REQUEST_INTERVAL)
 
+def fetch_transcript(url):
+    """Load a video's transcript and info once, from the cache when possible"""
+    video_id = YoutubeLoader.extract_video_id(url)
+    documents = read_cached_transcript(video_id)
+    if documents is not None:
+        return documents
+
+    for attempt in range(YOUTUBE_MAX_RETRIES + 1):
+        rate_limiter.acquire()
+        try:
+            documents = YoutubeLoader(video_id, add_video_info=True).load()
+        except Exception as e:
+            if not is_rate_limited(e) or attempt == YOUTUBE_MAX_RETRIES:
+                raise
+            rate_limiter.throttled()
+            logger.warning(f"Rate limited loading {url}, retrying at {rate_limiter.rate:.2f} req/s")
+            continue
+        rate_limiter.successful()
+        # No documents means captions are disabled; not cached, so they are retried once added
+        if documents:
+            write_cached_transcript(video_id, documents)
+        return documents
+
+
+def load_video_documents(batch_videos, max_workers=YOUTUBE_FETCH_WORKERS, splitter=text_splitter):
+    """Yield (url, chunk) pairs in input order, fetching transcripts concurrently"""
+
+    def load(url):
+        try:
+            return splitter.split_documents(fetch_transcript(url))
         except Exception as e:
             pprint(f"Failed to load data for URL {url}: {e}")
             logger.error(f"Failed to load data for URL {url}: {e}")
+            return []
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [(url, executor.submit(load, url)) for url in batch_videos]
+        for url, future in futures:
+            for video in future.result():
+                yield url, video
+    finally:
+        # A closed generator (e.g. a cancelled job) must not wait for queued fetches
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_video_documents(batch_videos, video_title, collection_name):
+    """Yield processed video chunks as they are loaded and lemmatized"""
+    for (url, video), lemmatized_text in iter_clean_and_lemmatize(
+        load_video_documents(batch_videos), text=lambda item: item[1].page_content
+    ):
+        processed_video = process_videos(
+            video, None, video.metadata, video_title, collection_name, lemmatized_text
+        )
+        processed_video.metadata["source"] = url
+        yield processed_video
 
-    return processed_videos
+
+def ingest_videos(batch_videos, video_title, collection_name):
+    """Process and ingest YouTube videos"""
+    return list(iter_video_documents(batch_videos, video_title, collection_name))
 
 
-def process_videos(video, nlp, metadata, video_title, collection_name):
+def process_videos(video, nlp, metadata, video_title, collection_name, lemmatized_text=None):
     """Process individual video for metadata, content, and embeddings"""
-    cleaned_text = clean_text(video.page_content)
-    lemmatized_text = lemmatize_text(cleaned_text, nlp)
+    if lemmatized_text is None:
+        cleaned_text = clean_text(video.page_content)
+        lemmatized_text = lemmatize_text(cleaned_text, nlp or get_nlp("lemmatizer"))
     title = metadata.get("title", "No Title")
     if title == "No Title":
         title = f"{video_title} Youtube"
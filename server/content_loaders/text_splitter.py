@@ -0,0 +1,115 @@
+from langchain_core.documents import Document as LangchainDocument
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+
+class OffsetTextSplitter:
+    """
+    A drop-in for RecursiveCharacterTextSplitter that works on offsets into the text.
+
+    Chunk boundaries are identical to Langchain's splitter with its default
+    separators, keep_separator=True and strip_whitespace=True. Splits are
+    (start, end) ranges into the original string, found with str.find in one
+    pass per separator level; because kept separators make adjacent splits
+    contiguous, a merged chunk is a single slice and the text is only copied
+    once per emitted chunk.
+
+    Attributes:
+        chunk_size: Maximum chunk length in characters.
+        chunk_overlap: Maximum overlap between consecutive chunks.
+        separators: Separators tried in order, from coarsest to finest.
+    """
+
+    def __init__(self, chunk_size=1000, chunk_overlap=200, separators=DEFAULT_SEPARATORS):
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size}), should be smaller."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+
+    def split_text(self, text):
+        chunks = []
+        self._split(text, 0, len(text), 0, chunks)
+        return chunks
+
+    def split_documents(self, documents):
+        """Split documents into chunk documents, each with a copy of its source's metadata."""
+        return [
+            LangchainDocument(page_content=chunk, metadata=dict(doc.metadata))
+            for doc in documents
+            for chunk in self.split_text(doc.page_content)
+        ]
+
+    def _split(self, text, start, end, level, chunks):
+        separators = self.separators
+        separator = separators[-1]
+        next_level = len(separators)
+        for i in range(level, len(separators)):
+            if separators[i] == "":
+                separator = ""
+                break
+            if text.find(separators[i], start, end) != -1:
+                separator = separators[i]
+                next_level = i + 1
+                break
+
+        good_splits = []
+        for split_start, split_end in self._split_offsets(text, start, end, separator):
+            if split_end - split_start < self.chunk_size:
+                good_splits.append((split_start, split_end))
+                continue
+            if good_splits:
+                self._merge(text, good_splits, chunks)
+                good_splits = []
+            if next_level >= len(separators):
+                chunks.append(text[split_start:split_end])
+            else:
+                self._split(text, split_start, split_end, next_level, chunks)
+        if good_splits:
+            self._merge(text, good_splits, chunks)
+
+    @staticmethod
+    def _split_offsets(text, start, end, separator):
+        """Ranges of text[start:end] cut before each separator, which starts the following range."""
+        if not separator:
+            return [(i, i + 1) for i in range(start, end)]
+        offsets = []
+        previous = start
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > previous:
+                offsets.append((previous, position))
+            previous = position
+            position = text.find(separator, position + len(separator), end)
+        if end > previous:
+            offsets.append((previous, end))
+        return offsets
+
+    def _merge(self, text, splits, chunks):
+        """Merge contiguous splits into chunks of at most chunk_size with up to chunk_overlap carried over."""
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        first = 0  # Index of the first split in the current chunk
+        total = 0
+        for index, (split_start, split_end) in enumerate(splits):
+            length = split_end - split_start
+            if total + length > chunk_size and index > first:
+                self._emit(text, splits[first][0], splits[index - 1][1], chunks)
+                while total > chunk_overlap or (total + length > chunk_size and total > 0):
+                    total -= splits[first][1] - splits[first][0]
+                    first += 1
+            total += length
+        if first < len(splits):
+            self._emit(text, splits[first][0], splits[-1][1], chunks)
+
+    @staticmethod
+    def _emit(text, start, end, chunks):
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+
+# Shared by the content loaders; the splitter holds no per-call state
+text_splitter = OffsetTextSplitter(chunk_size=1000, chunk_overlap=200)
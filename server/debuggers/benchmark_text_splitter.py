@@ -0,0 +1,76 @@
+"""
+Benchmark OffsetTextSplitter against Langchain's RecursiveCharacterTextSplitter.
+
+Splits the given text files (e.g. dumps of our largest crawls), or a
+synthetic corpus when none are given, with both splitters, checks the chunks
+are identical and prints the timings.
+
+Usage: python -m debuggers.benchmark_text_splitter [file ...] [--repeat N]
+"""
+import argparse
+import random
+import time
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from content_loaders.text_splitter import OffsetTextSplitter
+
+
+def synthetic_corpus(size=5_000_000, seed=0):
+    """Crawl-like text: short lines, paragraphs, and the odd long unbroken run."""
+    rng = random.Random(seed)
+    words = ["poker", "river", "turn", "flop", "range", "equity", "bluff", "value", "pot", "odds"]
+    parts, length = [], 0
+    while length < size:
+        roll = rng.random()
+        if roll < 0.01:
+            part = "x" * rng.randint(500, 3000)
+        elif roll < 0.1:
+            part = "\n\n"
+        elif roll < 0.3:
+            part = "\n"
+        else:
+            part = " ".join(rng.choice(words) for _ in range(rng.randint(1, 20))) + " "
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def time_split(splitter, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = [chunk for text in texts for chunk in splitter.split_text(text)]
+        best = min(best, time.perf_counter() - started)
+    return best, chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Text files to split")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per splitter; the best is reported")
+    args = parser.parse_args()
+
+    if args.files:
+        texts = []
+        for path in args.files:
+            with open(path, encoding="utf-8") as f:
+                texts.append(f.read())
+    else:
+        texts = [synthetic_corpus()]
+    characters = sum(len(text) for text in texts)
+
+    langchain_time, langchain_chunks = time_split(
+        RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200), texts, args.repeat
+    )
+    offset_time, offset_chunks = time_split(
+        OffsetTextSplitter(chunk_size=1000, chunk_overlap=200), texts, args.repeat
+    )
+
+    if offset_chunks != langchain_chunks:
+        raise SystemExit("Chunks differ between the splitters")
+    print(f"{characters:,} characters, {len(offset_chunks):,} identical chunks")
+    print(f"RecursiveCharacterTextSplitter: {langchain_time:.3f}s")
+    print(f"OffsetTextSplitter:             {offset_time:.3f}s ({langchain_time / offset_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,12 +18,13 @@ from services.logging_config import root_logger as logger
 from factory.limiter_factory import limiter
 from factory.cache_factory import cache
 from helpers.helper_functions import enable_pgvector_extension
+from helpers.vector_index import include_object
 
 load_dotenv()
 # Initialize extensions without the app context
 db = SQLAlchemy()
 
-migrate = Migrate()
+migrate = Migrate(include_object=include_object)
 jwt = JWTManager()
 
 
@@ -47,6 +48,77 @@ def seed_db_command():
     click.echo("Seeded the database.")
 
 
+@click.command("vector-index")
+@click.argument("action", type=click.Choice(["create", "rebuild", "drop", "list"]))
+@click.argument("collection_name", required=False)
+@click.option("--method", type=click.Choice(["hnsw", "ivfflat"]), default="hnsw")
+@click.option("--distance", type=click.Choice(["cosine", "l2", "inner"]), default="cosine")
+@click.option("--m", default=16, help="HNSW max connections per layer.")
+@click.option("--ef-construction", default=64, help="HNSW build-time candidate list size.")
+@click.option("--lists", type=int, default=None, help="IVFFlat list count (default: sized from the collection).")
+@click.option("--maintenance-work-mem", default=None, help="e.g. 1GB, speeds up index builds.")
+@with_appcontext
+def vector_index_command(action, collection_name, method, distance, m, ef_construction, lists, maintenance_work_mem):
+    """Create, rebuild, drop or list per-collection ANN indexes on langchain_pg_embedding."""
+    from helpers import vector_index
+
+    if action == "list":
+        for name, definition in vector_index.list_vector_indexes(db.engine):
+            click.echo(f"{name}: {definition}")
+        return
+
+    if not collection_name:
+        raise click.UsageError(f"COLLECTION_NAME is required for {action}")
+
+    if action == "create":
+        index_name = vector_index.create_vector_index(
+            db.engine,
+            collection_name,
+            method=method,
+            distance=distance,
+            m=m,
+            ef_construction=ef_construction,
+            lists=lists,
+            maintenance_work_mem=maintenance_work_mem,
+        )
+    elif action == "rebuild":
+        index_name = vector_index.rebuild_vector_index(db.engine, collection_name, method=method)
+    else:
+        index_name = vector_index.drop_vector_index(db.engine, collection_name, method=method)
+    click.echo(f"{action.capitalize()} {index_name} done.")
+
+
+@click.command("train-topic-model")
+@click.argument("collection_name")
+@click.option("--n-components", default=10, help="Number of topics.")
+@click.option("--model-type", type=click.Choice(["NMF", "LDA"]), default="NMF")
+@click.option("--as-default", is_flag=True, help="Also save as the model used when no collection is given.")
+@with_appcontext
+def train_topic_model_command(collection_name, n_components, model_type, as_default):
+    """Train the description topic model from a collection's ingested documents."""
+    import shutil
+    from sqlalchemy import text
+    from metadata.topic_model import train_topic_model, topic_model_path, DEFAULT_TOPIC_MODEL
+    from helpers.file_cache import atomic_path
+
+    corpus = db.session.execute(
+        text(
+            "SELECT e.document FROM langchain_pg_embedding e "
+            "JOIN langchain_pg_collection c ON c.uuid = e.collection_id "
+            "WHERE c.name = :name AND e.document IS NOT NULL"
+        ),
+        {"name": collection_name},
+    ).scalars().all()
+    if not corpus:
+        raise click.ClickException(f"No documents found for collection {collection_name}")
+
+    path = train_topic_model(corpus, collection_name, n_components=n_components, model_type=model_type)
+    if as_default:
+        with atomic_path(topic_model_path(DEFAULT_TOPIC_MODEL)) as tmp_path:
+            shutil.copyfile(path, tmp_path)
+    click.echo(f"Trained topic model on {len(corpus)} documents: {path}")
+
+
 def create_app():
     app = Flask(__name__)
     env_config = os.getenv("FLASK_ENV")
@@ -74,6 +146,17 @@ def create_app():
     with app.app_context():
         enable_pgvector_extension()
 
+    # Memory-map the offline topic models used for session descriptions
+    from metadata.topic_model import preload_topic_models
+
+    preload_topic_models()
+
+    # Start the Selenium fallback's browsers ahead of the first scrape
+    from services.browser_pool import BROWSER_POOL_WARM_ON_START, get_browser_pool
+
+    if BROWSER_POOL_WARM_ON_START:
+        get_browser_pool()
+
     from routes.users import users_blp
     from routes.chatbot import chatbot_blp
     from routes.blogs import blog_blp
@@ -82,6 +165,8 @@ def create_app():
 
     app.cli.add_command(init_db_command)
     app.cli.add_command(seed_db_command)
+    app.cli.add_command(vector_index_command)
+    app.cli.add_command(train_topic_model_command)
 
     # Register blueprints
     app.register_blueprint(blog_blp, url_prefix="/api/blog")
@@ -0,0 +1,38 @@
+import os
+import threading
+import spacy
+from services.logging_config import root_logger as logger
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Pipeline variants, keyed by name, with the components each one excludes
+NLP_VARIANTS = {
+    "full": [],
+    "lemmatizer": ["parser", "ner"],
+    "ner": ["tagger", "parser", "attribute_ruler", "lemmatizer"],
+}
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_nlp(variant="full"):
+    """
+    Return the shared spaCy pipeline for `variant`, loading it on first use.
+
+    Each variant is loaded once per process and reused by every caller.
+    """
+    nlp = _models.get(variant)
+    if nlp is not None:
+        return nlp
+
+    if variant not in NLP_VARIANTS:
+        raise ValueError(f"Unknown spaCy pipeline variant: {variant}")
+
+    with _models_lock:
+        nlp = _models.get(variant)
+        if nlp is None:
+            nlp = spacy.load(SPACY_MODEL, exclude=NLP_VARIANTS[variant])
+            _models[variant] = nlp
+            logger.info(f"Loaded spaCy model {SPACY_MODEL} ({variant}): {nlp.pipe_names}")
+    return nlp
@@ -77,3 +77,8 @@ class CoinGeckoAPIError(Exception):
     def __init__(self, message="CoinGecko API request failed.", status_code=400):
         super().__init__(message)
         self.status_code = status_code
+
+class JobCancelledError(Exception):
+    def __init__(self, message="Job cancelled: The job was cancelled before it finished.", status_code=409):
+        super().__init__(message)
+        self.status_code = status_code
@@ -0,0 +1,43 @@
+import gzip
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def read_json_gz(path):
+    """Load a gzipped JSON file, or return None when it is missing or unreadable."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path to write in place of `path`, renamed over it if the block succeeds.
+
+    The temporary file is uniquely named in the same directory, so readers
+    never see a partial file and concurrent writers of the same path don't
+    interleave.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_json_gz(path, data, **dump_kwargs):
+    """Atomically write `data` to a gzipped JSON file."""
+    with atomic_path(path) as tmp_path:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
@@ -0,0 +1,13 @@
+import multiprocessing
+import os
+
+# Process pools are started lazily from executor and request threads. Forking a
+# threaded process copies any lock another thread holds (logging, the spaCy
+# registry) into the child, where it is never released, so workers are started
+# from a clean forkserver process instead. "spawn" works too, but starts slower.
+PROCESS_POOL_START_METHOD = os.getenv("PROCESS_POOL_START_METHOD", "forkserver")
+
+
+def pool_context():
+    """Multiprocessing context for the app's process pools."""
+    return multiprocessing.get_context(PROCESS_POOL_START_METHOD)
@@ -0,0 +1,53 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket whose refill rate adapts to throttling.
+
+    acquire() blocks until a token is available. throttled() halves the rate
+    (down to `min_rate`) when the remote side pushes back, and each
+    successful() call recovers part of it, up to the configured `rate`.
+
+    Attributes:
+        max_rate: Tokens added per second when nothing is throttled.
+        rate: The current refill rate.
+        capacity: Tokens that can accumulate for a burst.
+    """
+
+    def __init__(self, rate, capacity=None, min_rate=None, recovery=1.1):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.capacity = capacity or max(1, int(rate))
+        self.recovery = recovery
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def throttled(self):
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0)
+
+    def successful(self):
+        with self._lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate * self.recovery)
@@ -0,0 +1,170 @@
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from .custom_exceptions import *
+from services.logging_config import root_logger as logger
+
+load_dotenv()
+
+# Per-collection ANN indexes are partial indexes named ix_embedding_ann_<method>_<collection uuid>
+ANN_INDEX_PREFIX = "ix_embedding_ann_"
+ANN_METHODS = ("hnsw", "ivfflat")
+# Operator classes matching PGVector's distance strategies
+ANN_OPCLASSES = {
+    "cosine": "vector_cosine_ops",
+    "l2": "vector_l2_ops",
+    "inner": "vector_ip_ops",
+}
+
+# Query-time search settings; unset means pgvector's defaults
+VECTOR_EF_SEARCH = os.getenv("VECTOR_EF_SEARCH")
+VECTOR_IVFFLAT_PROBES = os.getenv("VECTOR_IVFFLAT_PROBES")
+
+
+def ann_index_name(method, collection_id):
+    return f"{ANN_INDEX_PREFIX}{method}_{collection_id.hex}"
+
+
+def get_collection_id(connection, collection_name):
+    collection_id = connection.execute(
+        text("SELECT uuid FROM langchain_pg_collection WHERE name = :name"),
+        {"name": collection_name},
+    ).scalar()
+    if collection_id is None:
+        raise ResourceNotFoundError(f"Collection {collection_name} not found")
+    return collection_id
+
+
+@lru_cache(maxsize=None)
+def _lookup_engine(connection_string):
+    return create_engine(connection_string, pool_pre_ping=True, pool_size=2, max_overflow=2)
+
+
+def require_collection(connection_string, collection_name):
+    """Return the uuid of an existing collection, raising ResourceNotFoundError if there is none."""
+    with _lookup_engine(connection_string).connect() as connection:
+        return get_collection_id(connection, collection_name)
+
+
+def default_ivfflat_lists(row_count):
+    """pgvector's guideline: rows / 1000 up to 1M rows, sqrt(rows) beyond that."""
+    if row_count <= 1_000_000:
+        return max(row_count // 1000, 10)
+    return int(row_count**0.5)
+
+
+def create_vector_index(
+    engine,
+    collection_name,
+    method="hnsw",
+    distance="cosine",
+    m=16,
+    ef_construction=64,
+    lists=None,
+    maintenance_work_mem=None,
+):
+    """
+    Create a partial ANN index over the embeddings of one collection.
+
+    The index is built CONCURRENTLY so ingestion and retrieval keep running.
+    IVFFlat `lists` defaults to a value derived from the collection size.
+
+    Returns:
+        str: The name of the index.
+    """
+    if method not in ANN_METHODS:
+        raise BadRequestError(f"Unknown ANN index method: {method}")
+    if distance not in ANN_OPCLASSES:
+        raise BadRequestError(f"Unknown distance strategy: {distance}")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        collection_id = get_collection_id(connection, collection_name)
+        index_name = ann_index_name(method, collection_id)
+
+        if method == "hnsw":
+            options = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+        else:
+            if lists is None:
+                row_count = connection.execute(
+                    text("SELECT count(*) FROM langchain_pg_embedding WHERE collection_id = :id"),
+                    {"id": collection_id},
+                ).scalar()
+                lists = default_ivfflat_lists(row_count)
+            options = f"lists = {int(lists)}"
+
+        if maintenance_work_mem:
+            connection.execute(text(f"SET maintenance_work_mem = '{maintenance_work_mem}'"))
+
+        logger.info(f"Creating {method} index {index_name} for collection {collection_name} ({options})")
+        connection.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON langchain_pg_embedding USING {method} (embedding {ANN_OPCLASSES[distance]}) "
+                f"WITH ({options}) "
+                f"WHERE collection_id = '{collection_id}'"
+            )
+        )
+    return index_name
+
+
+def rebuild_vector_index(engine, collection_name, method="hnsw"):
+    """Rebuild a collection's ANN index, e.g. after a large re-ingestion."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        index_name = ann_index_name(method, get_collection_id(connection, collection_name))
+        logger.info(f"Rebuilding index {index_name}")
+        connection.execute(text(f"REINDEX INDEX CONCURRENTLY {index_name}"))
+    return index_name
+
+
+def drop_vector_index(engine, collection_name, method="hnsw"):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        index_name = ann_index_name(method, get_collection_id(connection, collection_name))
+        logger.info(f"Dropping index {index_name}")
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+    return index_name
+
+
+def list_vector_indexes(engine):
+    """Return (index name, definition) for every per-collection ANN index."""
+    with engine.connect() as connection:
+        return connection.execute(
+            text(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE tablename = 'langchain_pg_embedding' AND indexname LIKE :prefix"
+            ),
+            {"prefix": f"{ANN_INDEX_PREFIX}%"},
+        ).all()
+
+
+def set_vector_search_params(connection, ef_search=None, probes=None):
+    """
+    Apply ANN search settings to the current transaction with SET LOCAL.
+
+    `ef_search` tunes HNSW recall/latency, `probes` does the same for IVFFlat.
+    """
+    if ef_search is not None:
+        connection.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    if probes is not None:
+        connection.execute(text(f"SET LOCAL ivfflat.probes = {int(probes)}"))
+
+
+def default_search_params(ef_search=VECTOR_EF_SEARCH, probes=VECTOR_IVFFLAT_PROBES):
+    """
+    The configured ANN search settings, as keyword arguments for set_vector_search_params.
+
+    Returns an empty dict when neither setting is configured.
+    """
+    params = {}
+    if ef_search:
+        params["ef_search"] = int(ef_search)
+    if probes:
+        params["probes"] = int(probes)
+    return params
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep Alembic autogenerate from dropping per-collection ANN indexes."""
+    if type_ == "index" and reflected and name and name.startswith(ANN_INDEX_PREFIX):
+        return False
+    return True
@@ -3,10 +3,7 @@ from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lsa import LsaSummarizer
 
 from bs4 import BeautifulSoup as Soup
-import spacy
-
-# Initialize spaCy
-nlp = spacy.load("en_core_web_sm")
+from factory.nlp_factory import get_nlp
 
 # Initialize Sumy LSA summarizer
 summarizer = LsaSummarizer()
@@ -31,7 +28,7 @@ def generate_metadata(document):
     summary = extract_summary_from_text(document, sentence_count=5)
     
     # Generate keywords using spaCy
-    doc = nlp(document)
+    doc = get_nlp()(document)
     keywords = [chunk.text for chunk in doc.noun_chunks]
     
     # Create metadata dictionary
@@ -0,0 +1,61 @@
+import hashlib
+import numpy as np
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4  # 16-bit bands; fingerprints within 3 bits share at least one band
+SIMHASH_SHINGLE_SIZE = 3
+
+
+def normalize_chunk(text):
+    return " ".join(text.split())
+
+
+def exact_hash(text):
+    """sha256 of the whitespace-normalized text."""
+    return hashlib.sha256(normalize_chunk(text).encode("utf-8")).hexdigest()
+
+
+def simhash(text, shingle_size=SIMHASH_SHINGLE_SIZE):
+    """
+    64-bit SimHash of a text over word shingles, as an unsigned int.
+
+    Each shingle is hashed with blake2b; bit i of the fingerprint is set when
+    more than half of the shingle hashes have bit i set.
+    """
+    words = text.split()
+    if not words:
+        return 0
+    shingles = [
+        " ".join(words[i : i + shingle_size])
+        for i in range(max(len(words) - shingle_size + 1, 1))
+    ]
+    hashes = np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+            for shingle in shingles
+        ),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+
+def simhash_bands(fingerprint, bands=SIMHASH_BANDS):
+    width = SIMHASH_BITS // bands
+    mask = (1 << width) - 1
+    return [(fingerprint >> (i * width)) & mask for i in range(bands)]
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def to_signed64(value):
+    """Store unsigned 64-bit fingerprints in a signed BIGINT column."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def from_signed64(value):
+    return value + (1 << 64) if value < 0 else value
@@ -0,0 +1,117 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from factory.nlp_factory import get_nlp
+from helpers.process_pools import pool_context
+from metadata.transformers import clean_texts, lemmatize_texts
+from services.logging_config import root_logger as logger
+
+# Worker processes for the clean + lemmatize stage; 1 keeps it in-process
+NLP_PROCESS_WORKERS = int(os.getenv("NLP_PROCESS_WORKERS", os.cpu_count() or 1))
+# Chunks sent to a worker per task
+NLP_CHUNK_BATCH_SIZE = int(os.getenv("NLP_CHUNK_BATCH_SIZE", 64))
+# Batches in flight on the pool while streaming
+NLP_MAX_PENDING_BATCHES = int(os.getenv("NLP_MAX_PENDING_BATCHES", NLP_PROCESS_WORKERS * 2))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# The pipeline preloaded in each worker process
+_worker_nlp = None
+
+
+def _init_worker(variant):
+    global _worker_nlp
+    _worker_nlp = get_nlp(variant)
+
+
+def _clean_and_lemmatize_batch(texts):
+    cleaned_texts = clean_texts(texts)
+    # Workers are already one per core, so spaCy runs single-process inside them
+    return lemmatize_texts(cleaned_texts, _worker_nlp, n_process=1)
+
+
+def get_nlp_pool():
+    """Return the shared process pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=NLP_PROCESS_WORKERS,
+                mp_context=pool_context(),
+                initializer=_init_worker,
+                initargs=("lemmatizer",),
+            )
+            logger.info(f"Started NLP process pool with {NLP_PROCESS_WORKERS} workers")
+        return _pool
+
+
+def shutdown_nlp_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _clean_and_lemmatize_local(texts):
+    cleaned_texts = clean_texts(texts)
+    return lemmatize_texts(cleaned_texts, get_nlp("lemmatizer"))
+
+
+def iter_clean_and_lemmatize(
+    items,
+    text=lambda item: item,
+    batch_size=NLP_CHUNK_BATCH_SIZE,
+    max_pending=NLP_MAX_PENDING_BATCHES,
+):
+    """
+    Stream items through the clean + lemmatize stage, yielding (item, lemmatized_text) in input order.
+
+    Items are read lazily and at most `max_pending` batches of `batch_size` are
+    in flight on the pool, so memory stays bounded however long `items` is.
+    `text` extracts the text to lemmatize from an item.
+    """
+    use_pool = NLP_PROCESS_WORKERS > 1
+    pending = deque()  # (batch, future or lemmatized texts)
+
+    def submit(batch):
+        nonlocal use_pool
+        if use_pool:
+            try:
+                return get_nlp_pool().submit(_clean_and_lemmatize_batch, [text(item) for item in batch])
+            except BrokenProcessPool as e:
+                logger.error(f"NLP process pool failed, lemmatizing in-process: {e}")
+                shutdown_nlp_pool()
+                use_pool = False
+        return _clean_and_lemmatize_local([text(item) for item in batch])
+
+    def collect(batch, result):
+        nonlocal use_pool
+        if isinstance(result, list):
+            return result
+        try:
+            return result.result()
+        except BrokenProcessPool as e:
+            logger.error(f"NLP process pool failed, lemmatizing in-process: {e}")
+            shutdown_nlp_pool()
+            use_pool = False
+            return _clean_and_lemmatize_local([text(item) for item in batch])
+
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) < batch_size:
+            continue
+        pending.append((batch, submit(batch)))
+        batch = []
+        while len(pending) > max_pending:
+            done_batch, result = pending.popleft()
+            yield from zip(done_batch, collect(done_batch, result))
+    if batch:
+        pending.append((batch, submit(batch)))
+    while pending:
+        done_batch, result = pending.popleft()
+        yield from zip(done_batch, collect(done_batch, result))
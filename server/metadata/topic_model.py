@@ -0,0 +1,129 @@
+import os
+import threading
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import NMF, LatentDirichletAllocation
+from helpers.file_cache import atomic_path
+from services.logging_config import root_logger as logger
+
+TOPIC_MODEL_DIR = os.getenv("TOPIC_MODEL_DIR", os.path.join(os.getcwd(), "topic_models"))
+# Model used when a caller doesn't name a collection
+DEFAULT_TOPIC_MODEL = os.getenv("DEFAULT_TOPIC_MODEL", "default")
+
+_models = {}  # collection_name -> (file mtime, model)
+_models_lock = threading.Lock()
+
+
+def topic_model_path(collection_name):
+    return os.path.join(TOPIC_MODEL_DIR, f"{collection_name}.joblib")
+
+
+def train_topic_model(corpus, collection_name, n_components=10, n_top_words=10, model_type="NMF"):
+    """
+    Fit a TF-IDF vectorizer and an NMF or LDA topic model on a collection's corpus and save it.
+
+    The top words of every topic are computed once here so describing a text
+    later only needs a vectorizer transform and a dot product.
+
+    Returns:
+        str: The path of the saved model.
+    """
+    vectorizer = TfidfVectorizer(
+        max_df=0.95,
+        min_df=2,
+        stop_words="english",
+        ngram_range=(1, 2),
+        norm="l2",
+        use_idf=True,
+        smooth_idf=True,
+        sublinear_tf=True,
+    )
+    tfidf_matrix = vectorizer.fit_transform(corpus)
+
+    if model_type == "NMF":
+        model = NMF(n_components=n_components, random_state=1)
+    else:
+        model = LatentDirichletAllocation(n_components=n_components, random_state=1)
+    model.fit(tfidf_matrix)
+
+    feature_names = vectorizer.get_feature_names_out()
+    top_words = [
+        [feature_names[i] for i in topic.argsort()[: -n_top_words - 1 : -1]]
+        for topic in model.components_
+    ]
+
+    path = topic_model_path(collection_name)
+    # Servers reload the file when its mtime changes, so it is replaced, never written in place
+    with atomic_path(path) as tmp_path:
+        joblib.dump(
+            {
+                "vectorizer": vectorizer,
+                "components": np.ascontiguousarray(model.components_),
+                "top_words": top_words,
+            },
+            tmp_path,
+        )
+    with _models_lock:
+        _models.pop(collection_name, None)
+
+    logger.info(
+        f"Trained {model_type} topic model for {collection_name} on {len(corpus)} documents: {path}"
+    )
+    return path
+
+
+def load_topic_model(collection_name):
+    """
+    Return the saved topic model for a collection, or None if none was trained.
+
+    Models are loaded once per process with the topic matrix memory-mapped, and
+    reloaded when the file's mtime changes. Models are trained by the CLI in
+    another process, so a missing file is not cached and a model trained
+    while the server runs is picked up on the next call.
+    """
+    path = topic_model_path(collection_name)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _models.get(collection_name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _models_lock:
+        cached = _models.get(collection_name)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, joblib.load(path, mmap_mode="r"))
+            _models[collection_name] = cached
+            logger.info(f"Loaded topic model for {collection_name}")
+    return cached[1]
+
+
+def preload_topic_models():
+    """Memory-map every saved topic model, e.g. at app startup."""
+    if not os.path.isdir(TOPIC_MODEL_DIR):
+        return
+    for filename in os.listdir(TOPIC_MODEL_DIR):
+        if filename.endswith(".joblib"):
+            load_topic_model(filename[: -len(".joblib")])
+
+
+def predict_topic_words(text, collection_name=None):
+    """
+    Return the top words of the topic that best matches `text`, or None without a trained model.
+
+    The collection's model is used when one was trained, otherwise the default
+    model. The text is scored against each topic by projecting its TF-IDF vector onto
+    the topic matrix, which avoids running the NMF/LDA solver per request.
+    """
+    topic_model = (collection_name and load_topic_model(collection_name)) or load_topic_model(
+        DEFAULT_TOPIC_MODEL
+    )
+    if topic_model is None:
+        return None
+
+    tfidf_vector = topic_model["vectorizer"].transform([text])
+    scores = tfidf_vector @ topic_model["components"].T
+    return topic_model["top_words"][int(np.argmax(scores))]
@@ -1,10 +1,21 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
+import os
 import re
 from pprint import pprint
 from textblob import TextBlob
 from sklearn.decomposition import NMF, LatentDirichletAllocation
 from services.logging_config import root_logger as logger
 
+# Batch lemmatization settings
+LEMMATIZE_BATCH_SIZE = int(os.getenv("LEMMATIZE_BATCH_SIZE", 256))
+LEMMATIZE_N_PROCESS = int(os.getenv("LEMMATIZE_N_PROCESS", 1))
+# Components the lemmatizer does not depend on
+LEMMATIZE_DISABLED_PIPES = ["parser", "ner"]
+
+# clean_text patterns
+_NON_WORD = re.compile(r"[^\w\s]+")
+_DIGIT = re.compile(r"\d")
+
 
 def clean_text(text):
     """
@@ -13,10 +24,28 @@ def clean_text(text):
     if not isinstance(text, str):
         logger.error(f"clean text received non-string input: {type(text) - {text}}")
         return ""
-    text = re.sub(r"[^\w\s]", "", text)
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"\b\w*\d\w*\b", "", text)  # Remove words containing numbers
-    return text.lower()
+    text = _NON_WORD.sub("", text)
+    # Collapse whitespace runs to one space, keeping a leading and trailing one
+    tokens = text.split()
+    if not tokens:
+        return " " if text else ""
+    if _DIGIT.search(text):
+        # Remove words containing numbers, leaving the spaces around them
+        search = _DIGIT.search
+        tokens = [token if token.isalpha() or not search(token) else "" for token in tokens]
+    cleaned = " ".join(tokens)
+    if text[0].isspace():
+        cleaned = " " + cleaned
+    if text[-1].isspace():
+        cleaned += " "
+    return cleaned.lower()
+
+
+def clean_texts(texts):
+    """
+    Clean a batch of texts, returning a list in input order.
+    """
+    return [clean_text(text) for text in texts]
 
 
 def tfidf_transform(corpus):
@@ -54,6 +83,22 @@ def lemmatize_text(text, nlp):
     return lemmatized
 
 
+def lemmatize_texts(
+    texts, nlp, batch_size=LEMMATIZE_BATCH_SIZE, n_process=LEMMATIZE_N_PROCESS
+):
+    """
+    Lemmatize a batch of texts by streaming them through nlp.pipe.
+
+    The parser and NER components are disabled since lemmas only need the
+    tagger and attribute ruler. Returns the lemmatized texts in input order.
+    """
+    disable = [name for name in LEMMATIZE_DISABLED_PIPES if name in nlp.pipe_names]
+    docs = nlp.pipe(
+        texts, batch_size=batch_size, n_process=n_process, disable=disable
+    )
+    return [" ".join([token.lemma_ for token in doc]) for doc in docs]
+
+
 def extract_entities(text, nlp):
     """
     NER for extracting names, organisations, and locations from text.
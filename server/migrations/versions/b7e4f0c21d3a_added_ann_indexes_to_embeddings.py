@@ -0,0 +1,29 @@
+"""Added a collection index to langchain_pg_embedding.
+
+Revision ID: b7e4f0c21d3a
+Revises: 9c1d2e7a4b10
+Create Date: 2026-10-17 10:02:17.554920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4f0c21d3a'
+down_revision = '9c1d2e7a4b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Built CONCURRENTLY, outside the migration transaction, so writes to
+    # langchain_pg_embedding are not blocked while it builds. ANN indexes are
+    # per-collection partial indexes managed with `flask vector-index`.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_langchain_pg_embedding_collection_id', 'langchain_pg_embedding', ['collection_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_langchain_pg_embedding_collection_id', table_name='langchain_pg_embedding', postgresql_concurrently=True)
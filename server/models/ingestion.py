@@ -0,0 +1,109 @@
+# Description: Ingestion models for the application
+import uuid
+from enum import Enum
+from sqlalchemy import (
+    String,
+    Integer,
+    BigInteger,
+    DateTime,
+    Text,
+    Boolean,
+)
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Enum as SQLAlchemyEnum
+from factory import db
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class IngestionJob(db.Model):
+    __tablename__ = "ingestion_jobs"
+    id = db.Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    content_type = db.Column(String(20), nullable=False)  # url, pdf, video
+    collection_name = db.Column(String(80), nullable=False, index=True)
+    title = db.Column(String(255))
+    status = db.Column(SQLAlchemyEnum(JobStatus), default=JobStatus.PENDING, nullable=False, index=True)
+    cancel_requested = db.Column(Boolean, default=False, nullable=False)
+
+    # Progress counters
+    fetched = db.Column(Integer, default=0, nullable=False)  # Sources loaded
+    chunked = db.Column(Integer, default=0, nullable=False)  # Chunks produced
+    embedded = db.Column(Integer, default=0, nullable=False)  # Chunks embedded
+    written = db.Column(Integer, default=0, nullable=False)  # Rows written to the collection
+    deduplicated = db.Column(Integer, default=0, nullable=False)  # Duplicate chunks dropped before embedding
+
+    error = db.Column(Text, nullable=True)
+    created_at = db.Column(DateTime(timezone=True), default=func.now())
+    updated_at = db.Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    started_at = db.Column(DateTime(timezone=True), nullable=True)
+    finished_at = db.Column(DateTime(timezone=True), nullable=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "content_type": self.content_type,
+            "collection_name": self.collection_name,
+            "title": self.title,
+            "status": self.status.value,
+            "cancel_requested": self.cancel_requested,
+            "progress": {
+                "fetched": self.fetched,
+                "chunked": self.chunked,
+                "embedded": self.embedded,
+                "written": self.written,
+                "deduplicated": self.deduplicated,
+            },
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f"<IngestionJob {self.id}>"
+
+
+class SourceManifest(db.Model):
+    __tablename__ = "source_manifests"
+    id = db.Column(Integer, primary_key=True)
+    collection_name = db.Column(String(80), nullable=False)
+    source_id = db.Column(Text, nullable=False)  # URL, PDF path or video URL
+    source_type = db.Column(String(20), nullable=False)
+    etag = db.Column(String(255), nullable=True)
+    last_modified = db.Column(String(64), nullable=True)
+    content_hash = db.Column(String(64), nullable=True)  # sha256 of the source's chunks or file
+    chunk_ids = db.Column(ARRAY(String(64)), default=list, nullable=False)  # custom_id of each embedding row
+    created_at = db.Column(DateTime(timezone=True), default=func.now())
+    updated_at = db.Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        db.UniqueConstraint("collection_name", "source_id", name="uq_source_manifest_collection_source"),
+    )
+
+    def __repr__(self):
+        return f"<SourceManifest {self.collection_name}:{self.source_id}>"
+
+
+class ChunkFingerprint(db.Model):
+    __tablename__ = "chunk_fingerprints"
+    id = db.Column(Integer, primary_key=True)
+    collection_name = db.Column(String(80), nullable=False, index=True)
+    chunk_id = db.Column(String(64), nullable=False)
+    exact_hash = db.Column(String(64), nullable=False, index=True)  # sha256 of normalized text
+    simhash = db.Column(BigInteger, nullable=False)  # 64-bit SimHash, stored signed
+    # 16-bit SimHash bands used to find near-duplicate candidates
+    band_0 = db.Column(Integer, nullable=False, index=True)
+    band_1 = db.Column(Integer, nullable=False, index=True)
+    band_2 = db.Column(Integer, nullable=False, index=True)
+    band_3 = db.Column(Integer, nullable=False, index=True)
+    created_at = db.Column(DateTime(timezone=True), default=func.now())
+
+    def __repr__(self):
+        return f"<ChunkFingerprint {self.collection_name}:{self.chunk_id[:12]}>"
@@ -163,14 +163,28 @@ class EmbeddingStore(db.Model):
     __tablename__ = "langchain_pg_embedding"
 
     uuid = db.Column(db.UUID(as_uuid=True), primary_key=True)
-    collection_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('langchain_pg_collection.uuid', ondelete='CASCADE'), nullable=False)
+    collection_id = db.Column(db.UUID(as_uuid=True), db.ForeignKey('langchain_pg_collection.uuid', ondelete='CASCADE'), nullable=False, index=True)
     embedding = db.Column(Vector(1536)) 
     document = db.Column(String)
     cmetadata = db.Column(JSON)
-    custom_id = db.Column(String)
+    custom_id = db.Column(String, index=True)
 
     collection = relationship('CollectionStore', back_populates="embeddings")
 
+    # ANN indexes are per-collection partial indexes, managed with `flask vector-index`
+
+
+class EmbeddingCache(db.Model):
+    __tablename__ = "embedding_cache"
+
+    model_name = db.Column(String(100), primary_key=True)
+    text_hash = db.Column(String(64), primary_key=True)  # sha256 of normalized text
+    embedding = db.Column(Vector(), nullable=False)
+    created_at = db.Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<EmbeddingCache {self.model_name}:{self.text_hash[:12]}>"
+
 
 class Project(db.Model):
     __tablename__ = "projects"
@@ -1,12 +1,13 @@
 import os
 import re
+import json
 import uuid
 import logging
 import spacy
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 from pprint import pprint
-from flask import request, jsonify, send_file
+from flask import request, jsonify, send_file, Response, stream_with_context
 from flask.views import MethodView
 from flask_jwt_extended import create_access_token, create_refresh_token, get_jwt, get_jwt_identity, jwt_required
 from flask_smorest import Blueprint
@@ -17,11 +18,15 @@ from langchain.vectorstores.pgvector import PGVector
 from factory import db
 from models.users import User, UserQuery
 from chatbots.services.chatbot_service import ChatbotService
+from chatbots.services.async_chatbot_service import AsyncChatbotService
 from schemas.chatbots import ChatbotSchema, ConversationSessionSchema
 from chatbots.managers.chatbot_manager import ChatbotManager
 from chatbots.managers.message_manager import ChatMessageManager
 from chatbots.managers.session_manager import ConversationSessionManager
 from chatbots.utils.langchain_utility import LangchainUtility
+from chatbots.utils.retrieval_cache import get_retrieval_cache_stats
+from chatbots.embeddings.embedding_cache import get_embedding_cache_stats
+from services.ingestion_jobs import submit_ingestion_job
 import helpers.custom_exceptions as ce
 import helpers.helper_functions as hf
 from services.logging_config import root_logger as logger
@@ -32,6 +37,8 @@ load_dotenv()
 # Function to register a new Chatbot
 chatbot_blp = Blueprint("chatbot", "chatbot", url_prefix="/api/chatbot")
 chatbot_service = ChatbotService()
+async_chatbot_service = AsyncChatbotService()
+langchain_utility = LangchainUtility()
 chatbot_schema = ChatbotSchema()
 session_schema = ConversationSessionSchema()
 
@@ -52,6 +59,32 @@ def create_chatbot():
         logger.error(f"Failed to create chatbot: {e}")
         return jsonify({"error": "Failed to create chatbot"}), 500
 
+def format_sse(data, event=None):
+    """Format a Server-Sent Event with a JSON payload"""
+    message = f"data: {json.dumps(data)}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
+
+
+def stream_chat_response(session_id, user_message):
+    """Stream the chatbot answer as Server-Sent Events"""
+    def generate():
+        try:
+            for token in chatbot_service.stream_message(session_id, user_message):
+                yield format_sse({"token": token})
+            yield format_sse({}, event="done")
+        except Exception as e:
+            logger.error(f"Error in streamed chat interaction: {e}")
+            yield format_sse({"error": str(e)}, event="error")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @chatbot_blp.route("/chat", methods=["POST"])
 @jwt_required()
 def handle_chat_interaction():
@@ -64,12 +97,37 @@ def handle_chat_interaction():
         if not session_id or not user_message:
             return jsonify({"error": "session_id and message are required"}), 400
         
+        # Stream tokens when the client asks for it
+        if data.get("stream") or request.accept_mimetypes.best == "text/event-stream":
+            return stream_chat_response(session_id, user_message)
+
         response = chatbot_service.handle_message(session_id, user_message)
         return jsonify({"response": response}), 200
     except Exception as e:
         logger.error(f"Error in chat interaction: {e}")
         return jsonify({"error": str(e)}), 500
     
+@chatbot_blp.route("/chat-async", methods=["POST"])
+@jwt_required()
+async def handle_async_chat_interaction():
+    try:
+        user_id = get_jwt_identity()["id"]
+        data = request.get_json()
+        session_id = data.get("session_id")
+        user_message = data.get("message")
+        collection_name = data.get("collection_name")
+
+        if not session_id or not user_message:
+            return jsonify({"error": "session_id and message are required"}), 400
+
+        response = await async_chatbot_service.handle_message(
+            session_id, user_message, collection_name=collection_name, user_id=user_id
+        )
+        return jsonify({"response": response.content}), 200
+    except Exception as e:
+        logger.error(f"Error in async chat interaction: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @chatbot_blp.route("/session", methods=["POST"])
 @jwt_required()
 def create_sessionO():
@@ -90,16 +148,20 @@ def create_sessionO():
         return jsonify({"error": str(e)}), 500
 
 
+@chatbot_blp.route("/cache-stats", methods=["GET"])
+@jwt_required()
+def cache_stats():
+    return jsonify({
+        "retrieval": get_retrieval_cache_stats(),
+        "embeddings": get_embedding_cache_stats(),
+    }), 200
+
+
 @chatbot_blp.route("/get-embeddings/<collection_name>", methods=["GET"])
 @jwt_required()
 def get_embeddings(collection_name):
     try:
-        langchain_utility = LangchainUtility()
-        retriever = PGVector.from_existing_index(
-            embedding=langchain_utility.embeddings,
-            collection_name=collection_name,
-            connection_string=langchain_utility.connection_string,
-        )
+        retriever = langchain_utility.get_vectorstore(collection_name)
         
         # Retrieve all documents in collections
         documents = retriever.similarity_search("", k=1000)
@@ -125,11 +187,9 @@ def process_urls():
         return jsonify({"error": "No URLs provided"}), 400
     
     try:
-        langchain_utility = LangchainUtility()
-        processed_content = langchain_utility.ingest_and_embed_content("url", {"urls": urls, "url_title": url_title}, collection_name)
-        
-        serialized_content = [doc.to_dict() for doc in processed_content]
-        return jsonify({"message": "Content processed", "processed_content": serialized_content}), 200
+        # Crawling and embedding run on the ingestion workers; poll /api/process-data/jobs/<id>
+        job = submit_ingestion_job("url", urls, url_title, collection_name)
+        return jsonify({"message": "Ingestion job submitted", "job": job.to_dict()}), 202
         # response_text = "Your processed content is ready"
         
         # tts = gTTS(response_text)
@@ -149,9 +209,9 @@ def process_pdfs():
     pdfs = data.get('pdfs')
     collection_name = data.get('collection_name', 'default_collection')
     if pdfs:
-        langchain_utility = LangchainUtility()
-        processed_content = langchain_utility.ingest_and_embed_content("pdf", pdfs, collection_name)
-        return jsonify({"message": "Content processed", "processed_content": processed_content}), 200
+        # Runs as an incremental, deduplicated ingestion job; poll /api/process-data/jobs/<id>
+        job = submit_ingestion_job("pdf", pdfs, collection_name, collection_name)
+        return jsonify({"message": "Ingestion job submitted", "job": job.to_dict()}), 202
     else:
         return jsonify({"error": "No PDFs provided"}), 400
 
@@ -161,9 +221,8 @@ def process_videos():
     videos = data.get('videos')
     collection_name = data.get('collection_name', 'default_collection')
     if videos:
-        langchain_utility = LangchainUtility()
-        processed_content = langchain_utility.ingest_and_embed_content("videos", videos, collection_name)
-        return jsonify({"message": "Content processed", "processed_content": processed_content}), 200
+        job = submit_ingestion_job("video", videos, collection_name, collection_name)
+        return jsonify({"message": "Ingestion job submitted", "job": job.to_dict()}), 202
     else:
         return jsonify({"error": "No videos provided"}), 400
 
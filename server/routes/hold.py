@@ -34,7 +34,9 @@ def handle_chat_interaction():
         )
 
         # Generate a description of hte AI's response
-        ai_response_description = generate_description(final_response.get("answer", ""))
+        ai_response_description = generate_description(
+            final_response.get("answer", ""), collection_name
+        )
         # updated_conversation = update_conversation_session(
         #     session_id, topic_name, ai_response_description
         # )
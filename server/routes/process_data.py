@@ -18,11 +18,7 @@ from flask_jwt_extended import get_jwt
 from flask_jwt_extended import get_jwt_identity
 from flask_jwt_extended import jwt_required
 
-from content_loaders.process_urls import ingest_urls
-from content_loaders.process_pdfs import ingest_pdfs
-from content_loaders.process_youtube import ingest_videos
-from chatbots.embeddings.generate_embeddings import generate_embeddings
-from models.users import Project, DocumentType
+from services.ingestion_jobs import submit_ingestion_job, get_ingestion_job, cancel_ingestion_job
 from services.logging_config import root_logger as logger
 import helpers.custom_exceptions as ce
 import helpers.helper_functions as hf
@@ -78,40 +74,30 @@ def process_video():
 
 
 def process_content(content, content_type, title, collection_name):
-    process_functions = {
-        'url': ingest_urls,
-        'pdf': ingest_pdfs,
-        'video': ingest_videos
-    }
-    process_func = process_functions.get(content_type)
-
-    if not process_func:
+    try:
+        job = submit_ingestion_job(content_type, content, title, collection_name)
+        return jsonify({"message": "Ingestion job submitted", "job": job.to_dict()}), 202
+    except ce.BadRequestError as e:
         logger.error(f"Invalid content type: {content_type}")
-        return jsonify({"error": "Invalid content type"}), 400
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error submitting {content_type} ingestion job: {e}")
+        return jsonify({"error": f"Failed to process {content_type} due to {str(e)}"}), 500
 
+
+@process_data_blp.route("/jobs/<job_id>", methods=["GET"])
+def get_job_status(job_id):
     try:
-        processed_content = process_func(content, title, collection_name)
-        processed_text = ' '.join([doc.page_content for doc in processed_content])
-        processed_count = generate_embeddings(processed_content, OPENAI_API_KEY, CONNECTION_STRING, collection_name)
-        logger.info(f"Generated embeddings for {processed_count} items of type {content_type}")
-
-        existing_project = Project.query.filter_by(collection_name=collection_name).first()
-        if not existing_project:
-            for item in processed_content:
-                new_project = Project(
-                    title = item.metadata.get("title", "No title"),
-                    collection_name=collection_name,
-                    source_type=getattr(DocumentType, content_type.upper()),
-                    content = processed_text
-                )
-                hf.add_to_db(new_project)
-                logger.info(f"New project added to database with title: {new_project.title}")
-                return jsonify({"message": f"New project created with {processed_count} items processed"}), 201
-        else:
-            logger.warning(f"Project with collection name {collection_name} already exists")
-            return jsonify({"warning": "Project already exists"}), 409
-    
-    except Exception as e:
-        logger.error(f"Error processing {content_type}: {e}")
-        return jsonify({"error": "Failed to process {content_type} due to {str(e)}"}), 500
+        job = get_ingestion_job(job_id)
+        return jsonify({"job": job.to_dict()}), 200
+    except ce.ResourceNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+
 
+@process_data_blp.route("/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_job(job_id):
+    try:
+        job = cancel_ingestion_job(job_id)
+        return jsonify({"message": "Cancellation requested", "job": job.to_dict()}), 202
+    except ce.ResourceNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
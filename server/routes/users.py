@@ -5,7 +5,6 @@ import os
 from pprint import pprint
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import spacy
 
 # Flask configuration
 from flask.views import MethodView
@@ -39,8 +38,6 @@ users_blp = Blueprint("users", "users", url_prefix="/api/users")
 user_schema = UserSchema()
 user_login_schema = UserLoginSchema()
 
-nlp = spacy.load("en_core_web_sm")
-
 
 @users_blp.route("/register", methods=["POST"])
 class RegisterAPI(MethodView):
@@ -0,0 +1,211 @@
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from queue import LifoQueue, Empty
+from dotenv import load_dotenv
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+from services.logging_config import root_logger as logger
+
+load_dotenv()
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))  # Concurrent browsers
+BROWSER_POOL_WARM = int(os.getenv("BROWSER_POOL_WARM", 1))  # Browsers started ahead of use
+BROWSER_POOL_WARM_ON_START = os.getenv("BROWSER_POOL_WARM_ON_START", "false").lower() == "true"
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", 50))  # Pages before a browser is recycled
+BROWSER_MAX_MEMORY_MB = int(os.getenv("BROWSER_MAX_MEMORY_MB", 1024))  # RSS before a browser is recycled
+BROWSER_PAGE_TIMEOUT = int(os.getenv("BROWSER_PAGE_TIMEOUT", 60))  # Seconds per page load
+BROWSER_ACQUIRE_TIMEOUT = int(os.getenv("BROWSER_ACQUIRE_TIMEOUT", 300))  # Seconds to wait for a free browser
+
+
+@lru_cache(maxsize=1)
+def chromedriver_path():
+    """Resolve (and download if needed) chromedriver once per process."""
+    return ChromeDriverManager().install()
+
+
+def process_tree_rss(pid):
+    """
+    Resident memory in bytes of a process and its descendants, read from /proc.
+
+    Returns None where /proc is not available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after its closing parenthesis
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, stack = 0, [pid]
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            pass
+        stack.extend(children.get(current, []))
+    return total
+
+
+class PooledBrowser:
+    """A headless Chrome instance and the number of pages it has loaded."""
+
+    def __init__(self):
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        self.driver = webdriver.Chrome(service=ChromeService(chromedriver_path()), options=options)
+        self.driver.set_page_load_timeout(BROWSER_PAGE_TIMEOUT)
+        self.pages = 0
+
+    def memory_mb(self):
+        process = getattr(self.driver.service, "process", None)
+        rss = process_tree_rss(process.pid) if process else None
+        return rss / (1024 * 1024) if rss is not None else None
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Failed to quit browser: {e}")
+
+
+class BrowserPool:
+    """
+    A bounded pool of warm headless browsers that are reused across pages.
+
+    At most `size` browsers exist at once and callers block until one is free.
+    A browser is recycled once it has loaded `max_pages` pages, once its
+    process tree uses more than `max_memory_mb`, or after a WebDriver error.
+
+    Attributes:
+        size: Maximum number of browsers, and so of concurrent page loads.
+        warm: Browsers started by warm_up() before they are needed.
+        max_pages: Pages loaded by a browser before it is replaced.
+        max_memory_mb: Memory limit of a browser's process tree.
+    """
+
+    def __init__(
+        self,
+        size=BROWSER_POOL_SIZE,
+        warm=BROWSER_POOL_WARM,
+        max_pages=BROWSER_MAX_PAGES,
+        max_memory_mb=BROWSER_MAX_MEMORY_MB,
+    ):
+        self.size = size
+        self.warm = min(warm, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._idle = LifoQueue()  # Most recently used browser first
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def warm_up(self):
+        """Start `warm` browsers so the first fallback scrapes don't pay for a browser start."""
+        try:
+            while self._idle.qsize() < self.warm and not self._closed:
+                self._idle.put(PooledBrowser())
+        except Exception as e:
+            logger.error(f"Failed to warm browser pool: {e}")
+            return
+        logger.info(f"Browser pool warmed with {self._idle.qsize()} browsers")
+
+    @contextmanager
+    def browser(self, timeout=BROWSER_ACQUIRE_TIMEOUT):
+        """Borrow a browser, returning it to the pool (or recycling it) afterwards."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser free after {timeout}s")
+        browser = None
+        healthy = False
+        try:
+            try:
+                browser = self._idle.get_nowait()
+            except Empty:
+                browser = PooledBrowser()
+            yield browser
+            healthy = True
+        finally:
+            if browser is not None:
+                # A warm-up racing the first borrows can leave more browsers than slots
+                if (
+                    healthy
+                    and not self._closed
+                    and self._idle.qsize() < self.size
+                    and not self._should_recycle(browser)
+                ):
+                    self._idle.put(browser)
+                else:
+                    browser.quit()
+            self._slots.release()
+
+    def fetch(self, url):
+        """Load `url` in a pooled browser and return its page source."""
+        with self.browser() as browser:
+            try:
+                browser.driver.get(url)
+                browser.pages += 1
+                return browser.driver.page_source
+            except WebDriverException:
+                # A browser that failed mid-page is not trusted with the next one
+                browser.pages = self.max_pages
+                raise
+
+    def _should_recycle(self, browser):
+        if browser.pages >= self.max_pages:
+            logger.debug(f"Recycling browser after {browser.pages} pages")
+            return True
+        memory = browser.memory_mb()
+        if memory is not None and memory > self.max_memory_mb:
+            logger.info(f"Recycling browser using {memory:.0f} MB")
+            return True
+        try:
+            # Drop the previous page so its DOM and scripts don't linger
+            browser.driver.get("about:blank")
+        except WebDriverException:
+            return True
+        return False
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().quit()
+            except Empty:
+                break
+
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return the process-wide browser pool, creating it on first use."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+            threading.Thread(target=_browser_pool.warm_up, daemon=True).start()
+        return _browser_pool
+
+
+def shutdown_browser_pool():
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is not None:
+            _browser_pool.close()
+            _browser_pool = None
@@ -0,0 +1,234 @@
+import os
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from factory import db
+from models.ingestion import ChunkFingerprint
+from metadata.fingerprints import (
+    exact_hash,
+    simhash,
+    simhash_bands,
+    SIMHASH_BANDS,
+    hamming_distance,
+    to_signed64,
+    from_signed64,
+)
+import helpers.helper_functions as hf
+from services.logging_config import root_logger as logger
+
+# "collection" only drops chunks already stored in the same collection; "global" also drops chunks
+# stored in any other collection, at the cost of those chunks not being retrievable from this one
+DEDUP_SCOPE = os.getenv("DEDUP_SCOPE", "collection")
+# Maximum SimHash distance for a near duplicate; the 4 bands only guarantee recall up to 3 bits
+DEDUP_MAX_HAMMING = int(os.getenv("DEDUP_MAX_HAMMING", 3))
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+# Fingerprints looked up per query
+DEDUP_LOOKUP_BATCH_SIZE = int(os.getenv("DEDUP_LOOKUP_BATCH_SIZE", 500))
+
+
+class DedupReport:
+    def __init__(self, collection_name):
+        self.collection_name = collection_name
+        self.total = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+        self.saved_characters = 0
+        self.total_characters = 0
+        self.fingerprints = {}  # chunk_id -> fingerprint of each kept chunk
+
+    @property
+    def dropped(self):
+        return self.exact_duplicates + self.near_duplicates
+
+    @property
+    def kept(self):
+        return self.total - self.dropped
+
+    @property
+    def saved_ratio(self):
+        return self.saved_characters / self.total_characters if self.total_characters else 0.0
+
+    def to_dict(self):
+        return {
+            "collection_name": self.collection_name,
+            "total": self.total,
+            "kept": self.kept,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "saved_ratio": round(self.saved_ratio, 4),
+        }
+
+
+def fingerprint_document(doc):
+    """Exact hash of the chunk text and SimHash of its lemmatized text."""
+    fingerprint = simhash(getattr(doc, "lemmatized_text", None) or doc.page_content)
+    return exact_hash(doc.page_content), fingerprint, simhash_bands(fingerprint)
+
+
+def scoped_query(collection_name):
+    query = ChunkFingerprint.query
+    if DEDUP_SCOPE != "global":
+        query = query.filter(ChunkFingerprint.collection_name == collection_name)
+    return query
+
+
+def find_stored_duplicates(collection_name, fingerprints, exclude_ids=()):
+    """
+    Look up stored fingerprints matching a batch by exact hash or by any SimHash band.
+
+    Fingerprints of the chunks in `exclude_ids`, e.g. stale chunks about to be
+    deleted, are not matched, so an edited chunk is not dropped as a near
+    duplicate of its own previous version.
+
+    Returns:
+        tuple: (set of stored exact hashes, list of stored unsigned SimHashes)
+    """
+    hashes = {exact for exact, _, _ in fingerprints}
+    band_values = [set() for _ in range(SIMHASH_BANDS)]
+    for _, _, bands in fingerprints:
+        for i, band in enumerate(bands):
+            band_values[i].add(band)
+
+    query = scoped_query(collection_name).with_entities(
+        ChunkFingerprint.exact_hash, ChunkFingerprint.simhash
+    ).filter(
+        or_(
+            ChunkFingerprint.exact_hash.in_(hashes),
+            ChunkFingerprint.band_0.in_(band_values[0]),
+            ChunkFingerprint.band_1.in_(band_values[1]),
+            ChunkFingerprint.band_2.in_(band_values[2]),
+            ChunkFingerprint.band_3.in_(band_values[3]),
+        )
+    )
+    if exclude_ids:
+        # Chunk ids are derived from the collection name, so they are unique across collections
+        query = query.filter(ChunkFingerprint.chunk_id.notin_(list(exclude_ids)))
+    rows = query.all()
+    return {row.exact_hash for row in rows}, [from_signed64(row.simhash) for row in rows]
+
+
+def is_near_duplicate(fingerprint, candidates):
+    return any(hamming_distance(fingerprint, other) <= DEDUP_MAX_HAMMING for other in candidates)
+
+
+class ChunkDeduplicator:
+    """
+    Drops chunks that duplicate a stored chunk or a chunk it has already kept.
+
+    Exact duplicates are matched on the normalized chunk text and near duplicates
+    on the SimHash of the lemmatized text. One deduplicator can filter a stream
+    of batches; chunks kept from earlier batches are matched too. The report
+    keeps the fingerprints of kept chunks so they can be recorded once written.
+
+    Attributes:
+        collection_name: The collection being ingested into.
+        report: The running DedupReport.
+    """
+
+    def __init__(self, collection_name):
+        self.collection_name = collection_name
+        self.report = DedupReport(collection_name)
+        self.seen_hashes = set()
+        self.seen_bands = [{} for _ in range(SIMHASH_BANDS)]  # band value -> kept SimHashes
+
+    def filter(self, documents, exclude_ids=()):
+        """
+        Args:
+            documents (list): Documents with metadata["chunk_id"] set.
+            exclude_ids (iterable, optional): Ids of stored chunks not to match against,
+                e.g. the stale chunks of the sources being updated.
+
+        Returns:
+            list: The documents that are not duplicates.
+        """
+        report = self.report
+        report.total += len(documents)
+        report.total_characters += sum(len(doc.page_content) for doc in documents)
+        if not DEDUP_ENABLED or not documents:
+            return list(documents)
+
+        kept = []
+        for start in range(0, len(documents), DEDUP_LOOKUP_BATCH_SIZE):
+            batch = documents[start : start + DEDUP_LOOKUP_BATCH_SIZE]
+            fingerprints = [fingerprint_document(doc) for doc in batch]
+            stored_hashes, stored_simhashes = find_stored_duplicates(
+                self.collection_name, fingerprints, exclude_ids
+            )
+
+            for doc, (exact, fingerprint, bands) in zip(batch, fingerprints):
+                if exact in stored_hashes or exact in self.seen_hashes:
+                    report.exact_duplicates += 1
+                    report.saved_characters += len(doc.page_content)
+                    continue
+                batch_candidates = [
+                    other for i, band in enumerate(bands) for other in self.seen_bands[i].get(band, ())
+                ]
+                if is_near_duplicate(fingerprint, stored_simhashes) or is_near_duplicate(
+                    fingerprint, batch_candidates
+                ):
+                    report.near_duplicates += 1
+                    report.saved_characters += len(doc.page_content)
+                    continue
+
+                self.seen_hashes.add(exact)
+                for i, band in enumerate(bands):
+                    self.seen_bands[i].setdefault(band, []).append(fingerprint)
+                report.fingerprints[doc.metadata.get("chunk_id")] = (exact, fingerprint, bands)
+                kept.append(doc)
+        return kept
+
+    def log_report(self):
+        report = self.report
+        logger.info(
+            f"Dedup for {self.collection_name}: kept {report.kept}/{report.total} chunks, dropped "
+            f"{report.exact_duplicates} exact and {report.near_duplicates} near duplicates "
+            f"({report.saved_ratio:.1%} of characters)"
+        )
+
+
+def dedupe_chunks(documents, collection_name):
+    """
+    Drop duplicate chunks from one batch of documents.
+
+    Returns:
+        tuple: (kept documents, DedupReport)
+    """
+    deduplicator = ChunkDeduplicator(collection_name)
+    kept = deduplicator.filter(documents)
+    deduplicator.log_report()
+    return kept, deduplicator.report
+
+
+def record_fingerprints(collection_name, fingerprints):
+    """
+    Persist fingerprints of written chunks so later ingestions can match them.
+
+    Args:
+        collection_name (str): The collection the chunks were written to.
+        fingerprints (dict): chunk_id -> (exact hash, SimHash, bands), as kept in a DedupReport.
+    """
+    rows = [
+        {
+            "collection_name": collection_name,
+            "chunk_id": chunk_id,
+            "exact_hash": exact,
+            "simhash": to_signed64(value),
+            **{f"band_{i}": band for i, band in enumerate(bands)},
+        }
+        for chunk_id, (exact, value, bands) in fingerprints.items()
+    ]
+    for start in range(0, len(rows), DEDUP_LOOKUP_BATCH_SIZE):
+        db.session.execute(insert(ChunkFingerprint), rows[start : start + DEDUP_LOOKUP_BATCH_SIZE])
+    hf.update_db()
+    return len(rows)
+
+
+def delete_fingerprints(collection_name, chunk_ids):
+    """Forget the fingerprints of deleted chunks."""
+    if not chunk_ids:
+        return 0
+    deleted = ChunkFingerprint.query.filter(
+        ChunkFingerprint.collection_name == collection_name,
+        ChunkFingerprint.chunk_id.in_(list(chunk_ids)),
+    ).delete(synchronize_session=False)
+    hf.update_db()
+    return deleted
@@ -7,6 +7,15 @@ load_dotenv()
 class Config(object):
     """Base config, uses staging database server."""
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Bounded pool shared by the ORM and the chat history store
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 5)),
+        "pool_pre_ping": True,
+    }
+    # Flask-Executor pool that runs ingestion jobs
+    EXECUTOR_TYPE = "thread"
+    EXECUTOR_MAX_WORKERS = int(os.getenv("INGESTION_WORKERS", 4))
     DEBUG = False
     TESTING = False
 
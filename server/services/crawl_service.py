@@ -0,0 +1,214 @@
+import os
+import queue
+import threading
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+import scrapy
+from scrapy import signals
+from scrapy.crawler import CrawlerRunner
+from scrapy.http import TextResponse
+from services.logging_config import root_logger as logger
+
+load_dotenv()
+
+CRAWL_MAX_JOBS = int(os.getenv("CRAWL_MAX_JOBS", 4))  # Crawl jobs running at once
+CRAWL_PER_DOMAIN = int(os.getenv("CRAWL_PER_DOMAIN", 4))  # Concurrent requests per domain
+CRAWL_DEPTH_LIMIT = int(os.getenv("CRAWL_DEPTH_LIMIT", 2))  # Link depth followed from the start URL
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", 100))  # Pages per job
+CRAWL_JOB_TIMEOUT = int(os.getenv("CRAWL_JOB_TIMEOUT", 600))  # Seconds to wait for a job's items
+
+CRAWL_SETTINGS = {
+    "ROBOTSTXT_OBEY": True,
+    "CONCURRENT_REQUESTS": CRAWL_MAX_JOBS * CRAWL_PER_DOMAIN,
+    "CONCURRENT_REQUESTS_PER_DOMAIN": CRAWL_PER_DOMAIN,
+    "DEPTH_LIMIT": CRAWL_DEPTH_LIMIT,
+    "CLOSESPIDER_PAGECOUNT": CRAWL_MAX_PAGES,
+    "DOWNLOAD_TIMEOUT": 60,
+    "AUTOTHROTTLE_ENABLED": os.getenv("CRAWL_AUTOTHROTTLE", "true").lower() == "true",
+    "AUTOTHROTTLE_START_DELAY": float(os.getenv("CRAWL_AUTOTHROTTLE_START_DELAY", 1.0)),
+    "AUTOTHROTTLE_MAX_DELAY": float(os.getenv("CRAWL_AUTOTHROTTLE_MAX_DELAY", 30.0)),
+    "AUTOTHROTTLE_TARGET_CONCURRENCY": float(
+        os.getenv("CRAWL_AUTOTHROTTLE_TARGET_CONCURRENCY", CRAWL_PER_DOMAIN)
+    ),
+    # Crawl on whichever reactor the service thread runs rather than requiring the asyncio one
+    "TWISTED_REACTOR": None,
+    "TELNETCONSOLE_ENABLED": False,
+    "LOG_ENABLED": False,
+}
+
+# Marks the end of a job's item stream
+_DONE = object()
+
+
+class PageSpider(scrapy.Spider):
+    """Crawls a start URL and the same-domain pages it links to, yielding their text."""
+
+    name = "page_spider"
+
+    def __init__(self, url, title, collection, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.start_urls = [url]
+        self.allowed_domains = [urlparse(url).hostname]
+        self.title = title
+        self.collection = collection
+
+    def parse(self, response):
+        if not isinstance(response, TextResponse):
+            return
+        yield {
+            "url": response.url,
+            "title": self.title,
+            "collection": self.collection,
+            "content": " ".join(
+                text.strip() for text in response.css("body ::text").getall() if text.strip()
+            ),
+        }
+        yield from response.follow_all(css="a::attr(href)", callback=self.parse)
+
+
+class CrawlJob:
+    """
+    A queued crawl whose items can be consumed while it runs.
+
+    Items are passed to `on_item` (on the reactor thread) as they are scraped
+    and buffered for items() / result() on the caller's side.
+    """
+
+    def __init__(self, url, title, collection, on_item=None):
+        self.url = url
+        self.title = title
+        self.collection = collection
+        self.on_item = on_item
+        self.error = None
+        self._items = queue.Queue()
+        self.done = threading.Event()
+
+    def _item_scraped(self, item, response, spider):
+        item = dict(item)
+        if self.on_item:
+            try:
+                self.on_item(item)
+            except Exception as e:
+                logger.error(f"Crawl item callback failed for {self.url}: {e}")
+        self._items.put(item)
+
+    def _finish(self, error=None):
+        self.error = error
+        self.done.set()
+        self._items.put(_DONE)
+
+    def items(self, timeout=CRAWL_JOB_TIMEOUT):
+        """Yield items as they are scraped, raising if the crawl failed."""
+        while True:
+            item = self._items.get(timeout=timeout)
+            if item is _DONE:
+                break
+            yield item
+        if self.error:
+            raise RuntimeError(f"Crawl of {self.url} failed: {self.error}")
+
+    def result(self, timeout=CRAWL_JOB_TIMEOUT):
+        return list(self.items(timeout=timeout))
+
+
+class CrawlService:
+    """
+    Runs Scrapy crawls in-process on a Twisted reactor in a dedicated thread.
+
+    Jobs are queued by submit() from any thread and started on the reactor
+    thread, at most `max_jobs` at a time. The reactor cannot be restarted, so
+    there is one service per process.
+
+    Attributes:
+        settings: Scrapy settings shared by every crawl.
+        max_jobs: Crawl jobs running at once.
+    """
+
+    def __init__(self, settings=None, max_jobs=CRAWL_MAX_JOBS):
+        self.settings = settings or CRAWL_SETTINGS
+        self.max_jobs = max_jobs
+        self._jobs = queue.Queue()
+        self._active = 0
+        self._runner = None
+        self._reactor = None
+        self._thread = None
+
+    def start(self):
+        from twisted.internet import reactor
+
+        self._reactor = reactor
+        self._runner = CrawlerRunner(self.settings)
+        self._thread = threading.Thread(
+            target=reactor.run, kwargs={"installSignalHandlers": False}, name="crawl-reactor", daemon=True
+        )
+        self._thread.start()
+        logger.info("Started in-process crawl service")
+
+    def submit(self, url, title, collection, on_item=None):
+        """
+        Queue a crawl of `url`.
+
+        Args:
+            url (str): The start URL.
+            title (str): Title stored with every item.
+            collection (str): Collection name stored with every item.
+            on_item (callable, optional): Called with each item as it is scraped.
+
+        Returns:
+            CrawlJob: The job, whose items() can be iterated while it runs.
+        """
+        job = CrawlJob(url, title, collection, on_item)
+        self._jobs.put(job)
+        self._reactor.callFromThread(self._pump)
+        return job
+
+    def _pump(self):
+        # Runs on the reactor thread
+        while self._active < self.max_jobs:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            self._start_job(job)
+
+    def _start_job(self, job):
+        self._active += 1
+        try:
+            crawler = self._runner.create_crawler(PageSpider)
+            crawler.signals.connect(job._item_scraped, signal=signals.item_scraped)
+            deferred = self._runner.crawl(
+                crawler, url=job.url, title=job.title, collection=job.collection
+            )
+        except Exception as e:
+            self._job_finished(None, job, e)
+            return
+        deferred.addCallbacks(
+            self._job_finished,
+            lambda failure: self._job_finished(None, job, failure.getErrorMessage()),
+            callbackArgs=(job,),
+        )
+
+    def _job_finished(self, _, job, error=None):
+        self._active -= 1
+        if error:
+            logger.error(f"Crawl of {job.url} failed: {error}")
+        job._finish(error)
+        self._pump()
+
+    def stop(self):
+        if self._reactor and self._reactor.running:
+            self._reactor.callFromThread(self._reactor.stop)
+
+
+_crawl_service = None
+_crawl_service_lock = threading.Lock()
+
+
+def get_crawl_service():
+    """Return the process-wide crawl service, starting its reactor thread on first use."""
+    global _crawl_service
+    with _crawl_service_lock:
+        if _crawl_service is None:
+            _crawl_service = CrawlService()
+            _crawl_service.start()
+        return _crawl_service
@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from dotenv import load_dotenv
+from services.logging_config import root_logger as logger
+
+load_dotenv()
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(os.getcwd(), "http_cache"))
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", 512))  # Compressed bodies kept on disk
+# Serve only from the cache and never touch the network, for benchmarks and tests
+HTTP_CACHE_OFFLINE = os.getenv("HTTP_CACHE_OFFLINE", "false").lower() == "true"
+
+# Response headers kept with a cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        url TEXT PRIMARY KEY,
+        final_url TEXT NOT NULL,
+        headers TEXT NOT NULL,
+        body BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at);
+"""
+
+
+class HttpCache:
+    """
+    A disk-backed cache of GET responses that revalidates with conditional requests.
+
+    Bodies are stored zlib-compressed in a SQLite file. A cached URL is
+    re-requested with If-None-Match / If-Modified-Since and a 304 is answered
+    from disk. Once the stored bodies exceed `max_bytes`, the least recently
+    used entries are evicted. In `offline` mode only cached responses are
+    served and a miss raises requests.ConnectionError.
+
+    Attributes:
+        path: The SQLite file holding the cache.
+        max_bytes: Size limit of the compressed bodies.
+        offline: Whether to replay from the cache without network access.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_mb=HTTP_CACHE_MAX_MB, offline=HTTP_CACHE_OFFLINE):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite")
+        self.max_bytes = max_mb * 1024 * 1024
+        self.offline = offline
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0}
+        with self._write_lock:
+            self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get(self, url, timeout=60, headers=None):
+        """
+        GET `url`, answering from the cache when the server reports it unchanged.
+
+        Returns:
+            requests.Response: The live response, or one rebuilt from the cache
+                (with `from_cache` set) on a 304 or in offline mode.
+        """
+        entry = self._lookup(url)
+        if self.offline:
+            if entry is None:
+                self._count("misses")
+                raise requests.ConnectionError(f"{url} is not in the HTTP cache (offline mode)")
+            self._count("hits")
+            return self._touch_and_build(url, entry)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            cached_headers = entry[1]
+            if cached_headers.get("ETag"):
+                request_headers["If-None-Match"] = cached_headers["ETag"]
+            if cached_headers.get("Last-Modified"):
+                request_headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+        response = self._session().get(url, timeout=timeout, headers=request_headers)
+        if response.status_code == 304 and entry is not None:
+            self._count("revalidated")
+            return self._touch_and_build(url, entry)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self._store(url, response)
+        return response
+
+    def _lookup(self, url):
+        row = self._connection().execute(
+            "SELECT final_url, headers, body FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def _touch_and_build(self, url, entry):
+        final_url, headers, body = entry
+        with self._write_lock:
+            connection = self._connection()
+            connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+            connection.commit()
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = final_url
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = zlib.decompress(body)
+        response.from_cache = True
+        return response
+
+    def _store(self, url, response):
+        body = zlib.compress(response.content)
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        now = time.time()
+        with self._write_lock:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, final_url, headers, body, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, response.url, json.dumps(headers), body, len(body), now, now),
+            )
+            connection.commit()
+            self._evict(connection)
+        self._count("stored")
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Evict down to 90% of the limit so eviction doesn't run on every store
+        target = total - int(self.max_bytes * 0.9)
+        freed, urls = 0, []
+        for url, size in connection.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            if freed >= target:
+                break
+            urls.append((url,))
+            freed += size
+        connection.executemany("DELETE FROM responses WHERE url = ?", urls)
+        connection.commit()
+        with self._stats_lock:
+            self.stats["evicted"] += len(urls)
+        logger.info(f"Evicted {len(urls)} responses ({freed} bytes) from the HTTP cache")
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Return the process-wide HTTP cache, opening it on first use."""
+    global _http_cache
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache()
+        return _http_cache
+
+
+def cached_get(url, timeout=60, headers=None):
+    """GET through the shared HTTP cache, or straight to the network when it is disabled."""
+    if not HTTP_CACHE_ENABLED:
+        return requests.get(url, timeout=timeout, headers=headers)
+    return get_http_cache().get(url, timeout=timeout, headers=headers)
+
+
+def get_http_cache_stats():
+    return dict(get_http_cache().stats) if HTTP_CACHE_ENABLED else {}
@@ -0,0 +1,262 @@
+import os
+from itertools import groupby
+from datetime import datetime
+from dotenv import load_dotenv
+from flask import current_app
+from factory import db
+from models.ingestion import IngestionJob, JobStatus
+from models.users import Project, DocumentType
+from content_loaders.process_urls import iter_url_documents
+from content_loaders.process_pdfs import iter_pdf_documents
+from content_loaders.process_youtube import iter_video_documents
+from chatbots.embeddings.generate_embeddings import generate_embeddings
+from services.source_manifest import (
+    select_changed_sources,
+    plan_incremental_update,
+    drop_from_manifests,
+    delete_chunks,
+    save_manifests,
+)
+from services.chunk_dedup import ChunkDeduplicator, record_fingerprints, delete_fingerprints
+import helpers.custom_exceptions as ce
+import helpers.helper_functions as hf
+from services.logging_config import root_logger as logger
+
+load_dotenv()
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+CONNECTION_STRING = os.getenv("DEV_DATABASE_URL")
+
+# Characters of ingested text kept as the Project's content
+PROJECT_CONTENT_MAX_CHARS = int(os.getenv("PROJECT_CONTENT_MAX_CHARS", 100000))
+
+STREAM_FUNCTIONS = {
+    "url": iter_url_documents,
+    "pdf": iter_pdf_documents,
+    "video": iter_video_documents,
+}
+
+
+def submit_ingestion_job(content_type, content, title, collection_name):
+    """
+    Record an ingestion job and run it on the app's executor.
+
+    Args:
+        content_type (str): One of 'url', 'pdf' or 'video'.
+        content (str | list): A source or a list of sources.
+        title (str): The title stored with the ingested documents.
+        collection_name (str): The PGVector collection to ingest into.
+
+    Returns:
+        IngestionJob: The pending job.
+    """
+    if content_type not in STREAM_FUNCTIONS:
+        raise ce.BadRequestError(f"Invalid content type: {content_type}")
+
+    sources = [content] if isinstance(content, str) else list(content)
+    job = IngestionJob(content_type=content_type, collection_name=collection_name, title=title)
+    hf.add_to_db(job)
+
+    current_app.executor.submit(run_ingestion_job, job.id, sources)
+    logger.info(f"Submitted {content_type} ingestion job {job.id} for {collection_name}")
+    return job
+
+
+def get_ingestion_job(job_id):
+    job = hf.get_db_object(IngestionJob, id=job_id)
+    if not job:
+        raise ce.ResourceNotFoundError(f"Ingestion job {job_id} not found")
+    return job
+
+
+def cancel_ingestion_job(job_id):
+    """Request cancellation; a running job stops at its next checkpoint."""
+    job = get_ingestion_job(job_id)
+    if job.status == JobStatus.PENDING:
+        job.status = JobStatus.CANCELLED
+        job.finished_at = datetime.utcnow()
+    if job.status == JobStatus.RUNNING:
+        job.cancel_requested = True
+    hf.update_db()
+    return job
+
+
+class JobProgress:
+    """Persists a job's progress counters and raises JobCancelledError once cancellation is requested."""
+
+    def __init__(self, job):
+        self.job = job
+
+    def update(self, **counters):
+        for name, value in counters.items():
+            setattr(self.job, name, value)
+        hf.update_db()
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        db.session.refresh(self.job, ["cancel_requested"])
+        if self.job.cancel_requested:
+            raise ce.JobCancelledError()
+
+    def __call__(self, **counters):
+        self.update(**counters)
+
+
+class IngestionStream:
+    """
+    Turns a job's document stream into the documents to embed, one source at a time.
+
+    Loaders yield each source's chunks contiguously, so every source is diffed
+    against its manifest and deduplicated as soon as its chunks are in. Only
+    chunk ids, fingerprints and a bounded project preview are kept across
+    sources, so memory does not grow with the size of the corpus.
+    """
+
+    def __init__(self, job, sources, fingerprints, progress):
+        self.job = job
+        self.sources = sources
+        self.fingerprints = fingerprints
+        self.progress = progress
+        self.deduplicator = ChunkDeduplicator(job.collection_name)
+        self.stale_ids = []
+        self.manifests = []
+        self.fetched = 0
+        self.chunked = 0
+        self.project_title = None
+        self.project_content = []
+        self.project_chars = 0
+
+    def __iter__(self):
+        job = self.job
+        for _, chunks in groupby(self.documents(), key=lambda doc: doc.metadata.get("source")):
+            chunks = list(chunks)
+            self.fetched += 1
+            self.chunked += len(chunks)
+            self.add_to_project(chunks)
+
+            # Embed only new chunks, dropping duplicates before they cost an embedding
+            new_chunks, stale_ids, manifests = plan_incremental_update(
+                chunks, job.collection_name, job.content_type, self.fingerprints
+            )
+            self.stale_ids.extend(stale_ids)
+            self.manifests.extend(manifests)
+            # Stale chunks are deleted after the job, so they must not count as the originals
+            kept_chunks = self.deduplicator.filter(new_chunks, exclude_ids=self.stale_ids)
+            # Manifests list only written chunks, so a dropped chunk is reconsidered next time
+            dropped_ids = {doc.metadata["chunk_id"] for doc in new_chunks}.difference(
+                doc.metadata["chunk_id"] for doc in kept_chunks
+            )
+            drop_from_manifests(manifests, dropped_ids)
+            self.progress(
+                fetched=self.fetched,
+                chunked=self.chunked,
+                deduplicated=self.deduplicator.report.dropped,
+            )
+            yield from kept_chunks
+
+    def documents(self):
+        job = self.job
+        return STREAM_FUNCTIONS[job.content_type](
+            self.sources, job.title, job.collection_name
+        )
+
+    def add_to_project(self, chunks):
+        if self.project_title is None:
+            self.project_title = chunks[0].metadata.get("title", "No title")
+        for chunk in chunks:
+            if self.project_chars >= PROJECT_CONTENT_MAX_CHARS:
+                return
+            text = chunk.page_content[: PROJECT_CONTENT_MAX_CHARS - self.project_chars]
+            self.project_content.append(text)
+            self.project_chars += len(text) + 1
+
+
+def run_ingestion_job(job_id, sources):
+    """Load, chunk, embed and write the sources of a job, updating its status as it goes."""
+    job = hf.get_db_object(IngestionJob, id=job_id)
+    if not job or job.status != JobStatus.PENDING:
+        return
+
+    job.status = JobStatus.RUNNING
+    job.started_at = datetime.utcnow()
+    hf.update_db()
+    progress = JobProgress(job)
+    stream = None
+
+    try:
+        # Only sources that changed since the last run are fetched again
+        changed_sources, fingerprints = select_changed_sources(
+            job.content_type, sources, job.collection_name
+        )
+        stream = IngestionStream(job, changed_sources, fingerprints, progress)
+        if changed_sources and not generate_embeddings(
+            stream, OPENAI_API_KEY, CONNECTION_STRING, job.collection_name, progress=progress
+        ):
+            raise ce.InternalServerError("Failed to generate embeddings")
+        stream.deduplicator.log_report()
+        record_fingerprints(job.collection_name, stream.deduplicator.report.fingerprints)
+
+        # Drop the chunks that disappeared from changed sources
+        deleted = delete_chunks(job.collection_name, stream.stale_ids)
+        delete_fingerprints(job.collection_name, stream.stale_ids)
+        save_manifests(stream.manifests)
+        if deleted:
+            logger.info(f"Deleted {deleted} stale chunks from {job.collection_name}")
+        create_project(job, stream.project_title, " ".join(stream.project_content))
+
+        job.status = JobStatus.SUCCEEDED
+        logger.info(f"Ingestion job {job.id} finished: {job.written} rows written")
+    except ce.JobCancelledError:
+        db.session.rollback()
+        discard_written_chunks(job, stream)
+        job.status = JobStatus.CANCELLED
+        logger.info(f"Ingestion job {job.id} cancelled")
+    except Exception as e:
+        db.session.rollback()
+        discard_written_chunks(job, stream)
+        job.status = JobStatus.FAILED
+        job.error = str(e)
+        logger.error(f"Ingestion job {job.id} failed: {e}")
+    finally:
+        job.finished_at = datetime.utcnow()
+        hf.update_db()
+
+
+def discard_written_chunks(job, stream):
+    """
+    Delete the rows and fingerprints an unfinished job has already committed.
+
+    BulkVectorWriter commits as it goes, but manifests are only saved once the
+    job succeeds. Rows left behind by a failed or cancelled job would have no
+    manifest entry and be written again by the next run, so they are removed
+    and the collection is left as it was before the job.
+    """
+    if stream is None:
+        return
+    chunk_ids = list(stream.deduplicator.report.fingerprints)
+    try:
+        deleted = delete_chunks(job.collection_name, chunk_ids)
+        delete_fingerprints(job.collection_name, chunk_ids)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Could not discard the chunks written by ingestion job {job.id}: {e}")
+        return
+    if deleted:
+        logger.info(f"Discarded {deleted} chunks written by ingestion job {job.id}")
+
+
+def create_project(job, title, content):
+    """Create the collection's Project on its first ingestion."""
+    if not content:
+        return
+    if Project.query.filter_by(collection_name=job.collection_name).first():
+        logger.info(f"Project with collection name {job.collection_name} already exists")
+        return
+
+    new_project = Project(
+        title=title or "No title",
+        collection_name=job.collection_name,
+        source_type=getattr(DocumentType, job.content_type.upper()),
+        content=content,
+    )
+    hf.add_to_db(new_project)
+    logger.info(f"New project added to database with title: {new_project.title}")
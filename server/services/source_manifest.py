@@ -0,0 +1,189 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from factory import db
+from models.ingestion import SourceManifest
+from chatbots.utils.retrieval_cache import retrieval_cache
+import helpers.helper_functions as hf
+from services.logging_config import root_logger as logger
+
+# Metadata flag set by loaders on the documents of a source that was only partly loaded
+INCOMPLETE_SOURCE = "incomplete_source"
+
+# Concurrent workers when fingerprinting sources
+FINGERPRINT_WORKERS = int(os.getenv("FINGERPRINT_WORKERS", 8))
+
+
+def sha256_hex(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def chunk_id(collection_name, source_id, content):
+    """Deterministic ID for a chunk, stored as the embedding row's custom_id."""
+    return sha256_hex(f"{collection_name}\x00{source_id}\x00{content}")
+
+
+def fingerprint_source(content_type, source_id):
+    """
+    Cheap change indicators for a source, gathered before it is fetched.
+
+    Local PDFs are hashed. A URL source is the root of a crawl, and the root's
+    ETag/Last-Modified says nothing about the pages below it, so URLs are
+    always recrawled and diffed by chunk; the HTTP cache revalidates each
+    crawled page, so unchanged pages are not downloaded again. Videos have no
+    cheap indicator and are diffed by chunk too.
+    """
+    try:
+        if content_type == "pdf" and os.path.isfile(source_id):
+            digest = hashlib.sha256()
+            with open(source_id, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            return {"content_hash": digest.hexdigest()}
+    except Exception as e:
+        logger.warning(f"Could not fingerprint {source_id}: {e}")
+    return {}
+
+
+def is_unchanged(manifest, fingerprint):
+    if manifest is None or not manifest.chunk_ids:
+        return False
+    if fingerprint.get("etag") and fingerprint["etag"] == manifest.etag:
+        return True
+    if fingerprint.get("last_modified") and fingerprint["last_modified"] == manifest.last_modified:
+        return True
+    if fingerprint.get("content_hash") and fingerprint["content_hash"] == manifest.content_hash:
+        return True
+    return False
+
+
+def select_changed_sources(content_type, sources, collection_name):
+    """
+    Split sources into those that need (re)processing and those unchanged since the last run.
+
+    Returns:
+        tuple: (changed sources, {source: fingerprint} for the changed sources)
+    """
+    manifests = {
+        manifest.source_id: manifest
+        for manifest in SourceManifest.query.filter(
+            SourceManifest.collection_name == collection_name,
+            SourceManifest.source_id.in_(sources),
+        )
+    }
+    with ThreadPoolExecutor(max_workers=FINGERPRINT_WORKERS) as executor:
+        fingerprints = dict(
+            zip(sources, executor.map(lambda source: fingerprint_source(content_type, source), sources))
+        )
+
+    changed = [
+        source for source in sources if not is_unchanged(manifests.get(source), fingerprints[source])
+    ]
+    skipped = len(sources) - len(changed)
+    if skipped:
+        logger.info(f"Skipping {skipped} unchanged sources in {collection_name}")
+    return changed, {source: fingerprints[source] for source in changed}
+
+
+def plan_incremental_update(documents, collection_name, content_type, fingerprints):
+    """
+    Diff freshly processed documents against each source's manifest.
+
+    Documents must carry their source in metadata["source"]. Each document gets
+    a deterministic metadata["chunk_id"]. Sources that produced no documents,
+    e.g. because fetching failed, are left untouched. Sources whose documents
+    carry metadata[INCOMPLETE_SOURCE], e.g. a crawl where some pages failed,
+    get their new chunks but lose none of their previous ones.
+
+    Returns:
+        tuple: (new documents to embed, stale chunk ids to delete, updated manifests)
+    """
+    chunks_by_source = {}
+    incomplete_sources = set()
+    for doc in documents:
+        source_id = doc.metadata.get("source")
+        if doc.metadata.pop(INCOMPLETE_SOURCE, False):
+            incomplete_sources.add(source_id)
+        doc.metadata["chunk_id"] = chunk_id(collection_name, source_id, doc.page_content)
+        # Identical chunks within one source are stored once
+        chunks_by_source.setdefault(source_id, {}).setdefault(doc.metadata["chunk_id"], doc)
+
+    manifests = {
+        manifest.source_id: manifest
+        for manifest in SourceManifest.query.filter(
+            SourceManifest.collection_name == collection_name,
+            SourceManifest.source_id.in_(list(chunks_by_source)),
+        )
+    }
+
+    new_documents, stale_ids, updated_manifests = [], [], []
+    for source_id, chunks in chunks_by_source.items():
+        manifest = manifests.get(source_id) or SourceManifest(
+            collection_name=collection_name, source_id=source_id, source_type=content_type, chunk_ids=[]
+        )
+        old_ids = set(manifest.chunk_ids or [])
+        new_documents.extend(doc for key, doc in chunks.items() if key not in old_ids)
+
+        fingerprint = fingerprints.get(source_id, {})
+        manifest.etag = fingerprint.get("etag")
+        manifest.last_modified = fingerprint.get("last_modified")
+        if source_id in incomplete_sources:
+            # Chunks of pages that failed to load can't be told apart from removed ones, so all
+            # previous chunks are kept until a complete load; no validators, so it is re-diffed
+            logger.warning(f"Source {source_id} was only partly loaded, keeping its previous chunks")
+            manifest.content_hash = None
+            manifest.chunk_ids = list(dict.fromkeys([*(manifest.chunk_ids or []), *chunks]))
+        else:
+            stale_ids.extend(old_ids.difference(chunks))
+            manifest.content_hash = fingerprint.get("content_hash") or sha256_hex("".join(chunks))
+            manifest.chunk_ids = list(chunks)
+        updated_manifests.append(manifest)
+
+    logger.info(
+        f"Incremental update for {collection_name}: {len(new_documents)} new chunks, "
+        f"{len(stale_ids)} stale chunks across {len(chunks_by_source)} sources"
+    )
+    return new_documents, stale_ids, updated_manifests
+
+
+def drop_from_manifests(manifests, chunk_ids):
+    """
+    Remove chunks that were not written, e.g. dropped as duplicates, from updated manifests.
+
+    A source missing some of its chunks keeps no change indicators, so it is
+    never skipped as unchanged and those chunks are reconsidered next time.
+    """
+    chunk_ids = set(chunk_ids)
+    if not chunk_ids:
+        return
+    for manifest in manifests:
+        kept_ids = [key for key in manifest.chunk_ids if key not in chunk_ids]
+        if len(kept_ids) < len(manifest.chunk_ids):
+            manifest.chunk_ids = kept_ids
+            manifest.etag = manifest.last_modified = manifest.content_hash = None
+
+
+def delete_chunks(collection_name, chunk_ids):
+    """Delete embedding rows of a collection by custom_id."""
+    if not chunk_ids:
+        return 0
+    result = db.session.execute(
+        text(
+            "DELETE FROM langchain_pg_embedding e USING langchain_pg_collection c "
+            "WHERE e.collection_id = c.uuid AND c.name = :name AND e.custom_id = ANY(:ids)"
+        ),
+        {"name": collection_name, "ids": list(chunk_ids)},
+    )
+    hf.update_db()
+    if result.rowcount:
+        retrieval_cache.invalidate(collection_name)
+    return result.rowcount
+
+
+def save_manifests(manifests):
+    for manifest in manifests:
+        db.session.add(manifest)
+    hf.update_db()
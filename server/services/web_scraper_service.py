@@ -1,51 +1,21 @@
-import scrapy
-from scrapy.crawler import CrawlerProcess
-from scrapy.settings import Settings
-import subprocess
-import os
-import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from services.crawl_service import get_crawl_service
+from services.browser_pool import get_browser_pool
+from services.logging_config import root_logger as logger
 
-def scrape_with_scrapy(url, title, collection):
+def scrape_with_scrapy(url, title, collection, on_item=None):
+    """Crawl `url` on the in-process crawl service and return the scraped items, or None on failure."""
     try:
-        spider_name = "web_scraper_spider"
-        settings = {
-            'FEEDS': {
-                'output.json': {
-                    'format': 'json',
-                    'overwrite': True
-                }
-            }
-        }
-
-        process = subprocess.Popen(
-            ['scrapy', 'crawl', spider_name, '-a', f'url={url}', '-a', f'title={title}', '-a', f'collection={collection}'],
-            cwd=os.path.join(os.getcwd(), 'server/web_scraper'),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-
-        stdout, stderr = process.communicate()
-
-        if process.returncode == 0:
-            with open(os.path.join(os.getcwd(), 'server/web_scraper/output.json')) as f:
-                data = json.load(f)
-                return data
-        else:
-            raise Exception(stderr.decode())
-
+        job = get_crawl_service().submit(url, title, collection, on_item=on_item)
+        return job.result()
     except Exception as e:
+        logger.error(f"Scrapy crawl of {url} failed: {e}")
         return None
 
 
+def stream_with_scrapy(url, title, collection):
+    """Yield items from a crawl of `url` as they are scraped."""
+    yield from get_crawl_service().submit(url, title, collection).items()
+
+
 def scrape_with_selenium(url):
-    options = webdriver.ChromeOptions()
-    options.headless = True
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.get(url)
-    html_content = driver.page_source
-    driver.quit()
-    return html_content
\ No newline at end of file
+    return get_browser_pool().fetch(url)
@@ -2,19 +2,18 @@ import os
 import re
 from textwrap import shorten
 from datetime import datetime
-import spacy
 import warnings
 from models.chatbots import ConversationSession, ConversationStatus
 import helpers.helper_functions as hf
 from factory import db
+from factory.nlp_factory import get_nlp
 from metadata.transformers import *
+from metadata.topic_model import predict_topic_words
 from services.logging_config import root_logger as logger
 
 # Suppress only the specific warning from BeautifulSoup
 warnings.filterwarnings("ignore", category=Warning)
 
-nlp = spacy.load("en_core_web_sm")
-
 
 def extract_topic_from_query(query):
     # Simplistic approach: use the first few words or apply more complex logic
@@ -32,13 +31,13 @@ def extract_description_from_response(response):
     return shorten(first_sentence, width=100, placeholder="...")
 
 
-def get_or_create_conversation_session(user_id, query, response):
+def get_or_create_conversation_session(user_id, query, response, collection_name=None):
     try:
-        topic_name = generate_topic_name(query, nlp)
+        topic_name = generate_topic_name(query, get_nlp())
         response_text = (
             response.get("answer", "") if isinstance(response, dict) else response
         )
-        description = generate_description(response_text)
+        description = generate_description(response_text, collection_name)
 
         session = ConversationSession.query.filter_by(
             user_id=user_id, topic_name=topic_name
@@ -121,7 +120,7 @@ def extract_entities(query, nlp):
     return combined_terms
 
 
-def generate_description(text):
+def generate_description(text, collection_name=None):
     # Ensure text is a string and not empty
     if not isinstance(text, str) or not text.strip():
         logger.warning(f"Generate description received empty or invalid text: '{text}'")
@@ -129,13 +128,16 @@ def generate_description(text):
 
     try:
         logger.debug(f"Generating description for response: {text}")
-        tfidf_matrix, feature_names = tfidf_transform([text])
-        topics = get_topics(tfidf_matrix, feature_names)
+        # Prefer the offline-trained topic model; fit one on the fly only without it
+        topic_words = predict_topic_words(text, collection_name)
+        if topic_words is None:
+            tfidf_matrix, feature_names = tfidf_transform([text])
+            topic_words = get_topics(tfidf_matrix, feature_names)[0]
         sentiment = get_sentiment(text)
         sentiment_desc = (
             "Positive" if sentiment > 0 else "Negative" if sentiment < 0 else "Neutral"
         )
-        result = f"Topics: {', '.join(topics[0])}. Sentiment: {sentiment_desc}."
+        result = f"Topics: {', '.join(topic_words)}. Sentiment: {sentiment_desc}."
         logger.debug(f"Generated description: {result}")
         return result
     except Exception as e: